@@ -0,0 +1,83 @@
+import pygame
+from support import read_folder, convert_folder
+
+class AssetManager:
+    def __init__(self) -> None:
+        self.images = {}
+        self.folders = {}
+        self.folder_dicts = {}
+        self.sounds = {}
+
+        # analytics
+        self.load_counts = {}
+        self.requests = 0
+
+    def count_load(self, path) -> None:
+        self.load_counts[path] = self.load_counts.get(path, 0) + 1
+
+    # store decoded assets (used directly by the background loader)
+    def store_image(self, path, surf) -> None:
+        self.images[path] = surf.convert_alpha()
+        self.count_load(path)
+
+    def store_folder(self, path, sheet, frames) -> None:
+        frames = convert_folder(sheet, frames)
+        self.folders[path] = list(frames.values())
+        self.folder_dicts[path] = {image.split('.')[0]: surf for image, surf in frames.items()}
+        self.count_load(path)
+
+    def store_sound(self, path, sound) -> None:
+        self.sounds[path] = sound
+        self.count_load(path)
+
+    def image(self, path) -> pygame.Surface:
+        self.requests += 1
+        if path not in self.images:
+            self.store_image(path, pygame.image.load(path))
+        return self.images[path]
+
+    def folder(self, path) -> list:
+        self.requests += 1
+        if path not in self.folders:
+            self.store_folder(path, *read_folder(path))
+        return self.folders[path]
+
+    def folder_dict(self, path) -> dict:
+        self.requests += 1
+        if path not in self.folder_dicts:
+            self.store_folder(path, *read_folder(path))
+        return self.folder_dicts[path]
+
+    def sound(self, path) -> pygame.mixer.Sound:
+        self.requests += 1
+        if path not in self.sounds:
+            self.store_sound(path, pygame.mixer.Sound(path))
+        return self.sounds[path]
+
+    def unload(self, path) -> None:
+        # drop large one-off images once they have been baked
+        self.images.pop(path, None)
+        self.folders.pop(path, None)
+        self.folder_dicts.pop(path, None)
+        self.sounds.pop(path, None)
+
+    def stats(self) -> dict:
+        surfs = list(self.images.values())
+        for frames in self.folders.values():
+            surfs += frames
+
+        # decoded sound size from the mixer format
+        frequency, size, channels = pygame.mixer.get_init() or (0, 0, 0)
+        sample_bytes = frequency * channels * abs(size) // 8
+
+        return {
+            'images': len(self.images),
+            'folders': len(self.folders),
+            'sounds': len(self.sounds),
+            'loads': sum(self.load_counts.values()),
+            'requests': self.requests,
+            'image bytes': sum(surf.get_width() * surf.get_height() * surf.get_bytesize() for surf in surfs),
+            'sound bytes': int(sum(sound.get_length() for sound in self.sounds.values()) * sample_bytes)
+        }
+
+assets = AssetManager()
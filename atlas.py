@@ -0,0 +1,78 @@
+import pygame
+import os
+from json import dump, load
+from settings import ATLAS_PATH, ATLAS_WIDTH
+
+def get_sources(path) -> list:
+    # image files in the same order read_folder walks the loose files
+    folder_name, sub_folder, img_files = next(os.walk(path), (path, [], []))
+    return [(image, path + '/' + image) for image in img_files]
+
+def get_atlas_paths(path) -> tuple:
+    name = path.strip('./').replace('/', '_')
+    return ATLAS_PATH + name + '.png', ATLAS_PATH + name + '.json'
+
+def pack_surfaces(surfs) -> tuple:
+    # shelf packing: left to right, new row when the width runs out
+    frames = {}
+    x = y = row_height = width = 0
+    for name, surf in surfs:
+        w, h = surf.get_size()
+        if x + w > ATLAS_WIDTH and x > 0:
+            x = 0
+            y += row_height
+            row_height = 0
+        frames[name] = [x, y, w, h]
+        x += w
+        width = max(width, x)
+        row_height = max(row_height, h)
+
+    sheet = pygame.Surface((max(width, 1), max(y + row_height, 1)), pygame.SRCALPHA)
+    for name, surf in surfs:
+        sheet.blit(surf, frames[name][:2])
+    return sheet, frames
+
+def build_atlas(path) -> None:
+    sources = get_sources(path)
+    if not sources:
+        return
+    sheet, frames = pack_surfaces([(image, pygame.image.load(full_path)) for image, full_path in sources])
+
+    # write sheet + frame index
+    image_path, index_path = get_atlas_paths(path)
+    os.makedirs(ATLAS_PATH, exist_ok = True)
+    pygame.image.save(sheet, image_path)
+    with open(index_path, 'w') as outfile:
+        dump({
+            'order': [image for image, full_path in sources],
+            'frames': frames,
+            'mtimes': {image: os.path.getmtime(full_path) for image, full_path in sources}
+        }, outfile)
+
+def read_atlas(path):
+    image_path, index_path = get_atlas_paths(path)
+    if not os.path.exists(index_path):
+        return None
+    with open(index_path, 'r') as openfile:
+        index = load(openfile)
+
+    # stale when any source was added, removed or modified
+    sources = get_sources(path)
+    if len(sources) != len(index['mtimes']):
+        return None
+    for image, full_path in sources:
+        if index['mtimes'].get(image) != os.path.getmtime(full_path):
+            return None
+
+    # decoded but not converted, so this can run off the main thread
+    sheet = pygame.image.load(image_path)
+    return sheet, {image: index['frames'][image] for image in index['order']}
+
+def build_all(root) -> None:
+    for folder_name, sub_folder, img_files in os.walk(root):
+        if any(image.endswith('.png') for image in img_files):
+            build_atlas(folder_name)
+            print(f'packed {folder_name}')
+
+if __name__ == '__main__':
+    build_all('../graphics')
@@ -0,0 +1,125 @@
+import os
+from argparse import ArgumentParser
+from json import dump
+from time import perf_counter
+
+# headless drivers, set before pygame initializes
+os.environ['SDL_VIDEODRIVER'] = 'dummy'
+os.environ['SDL_AUDIODRIVER'] = 'dummy'
+
+import pygame
+from settings import *
+from profiler import profiler
+from level import Level
+from controls import Controls
+from rng import rng
+from replay import Replayer, read_saves, write_saves, get_state_digest
+
+# scripted input: (first frame, last frame, keys) within a repeating cycle
+SCRIPT = [
+    (0, 90, [pygame.K_RIGHT]),
+    (90, 180, [pygame.K_DOWN]),
+    (180, 182, [pygame.K_SPACE]),
+    (240, 330, [pygame.K_LEFT]),
+    (330, 332, [pygame.K_q]),
+    (340, 342, [pygame.K_SPACE]),
+    (400, 490, [pygame.K_UP]),
+    (490, 492, [pygame.K_LALT]),
+    (520, 522, [pygame.K_e]),
+    (540, 630, [pygame.K_RIGHT, pygame.K_UP])
+]
+SCRIPT_LENGTH = 720
+
+class ScriptedKeys:
+    def __init__(self, controls) -> None:
+        self.controls = controls
+        self.held = set()
+
+    def update(self, frame) -> None:
+        # press and release keys as the script moves on, like real key events
+        cycle_frame = frame % SCRIPT_LENGTH
+        held = {key for start, end, keys in SCRIPT if start <= cycle_frame < end for key in keys}
+        for key in self.held - held:
+            self.controls.release(key)
+        for key in held - self.held:
+            self.controls.press(key)
+        self.held = held
+
+def run(frames, dt, raining, seed = 0, replay = None) -> dict:
+    pygame.init()
+    pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    controls = Controls()
+    script = ScriptedKeys(controls)
+    if replay:
+        # a recording brings its own seed, saves, input and frame times
+        replayer = Replayer(replay, controls)
+        replayer.restore_saves()
+        frames = len(replayer.frames)
+    else:
+        rng.seed(seed)
+
+    start = perf_counter()
+    level = Level(controls, has_save())
+    load_time = perf_counter() - start
+    if raining is not None:
+        # same weather setup as a new day
+        level.raining = raining
+        level.soil_layer.raining = raining
+        level.set_weather_tint()
+        if raining:
+            level.soil_layer.water_all()
+
+    # every frame counts, not just a rolling window
+    profiler.window = frames
+    profiler.samples = {}
+    profiler.enabled = True
+    for frame in range(frames):
+        if replay:
+            frame_dt = replayer.begin_frame()
+        else:
+            script.update(frame)
+            frame_dt = dt
+        pygame.event.pump()
+        start = perf_counter()
+        level.run(frame_dt)
+        controls.end_step()
+        pygame.display.update()
+        profiler.end_frame(perf_counter() - start)
+    profiler.enabled = False
+
+    return {
+        'frames': frames,
+        'dt': dt,
+        'raining': level.raining,
+        'load': load_time * 1000,
+        'sprites': len(level.all_sprites),
+        'seed': rng.session_seed,
+        'state': get_state_digest(level),
+        'timings': {name: profiler.stats(name) for name in profiler.samples}
+    }
+
+if __name__ == '__main__':
+    parser = ArgumentParser(description = 'Run the level headless and report frame times in ms.')
+    parser.add_argument('--frames', type = int, default = 1200)
+    parser.add_argument('--dt', type = float, default = 1 / 60)
+    parser.add_argument('--rain', dest = 'raining', action = 'store_true', default = None)
+    parser.add_argument('--no-rain', dest = 'raining', action = 'store_false')
+    parser.add_argument('--seed', type = int, default = 0)
+    parser.add_argument('--replay', metavar = 'PATH', help = 'drive the level from a recorded replay instead of the script')
+    parser.add_argument('--out', default = 'benchmark.json')
+    args = parser.parse_args()
+
+    # the scripted tools write to the save files, keep the player's copies
+    backups = read_saves()
+    try:
+        results = run(args.frames, args.dt, args.raining, args.seed, args.replay)
+    finally:
+        write_saves(backups)
+
+    with open(args.out, 'w') as outfile:
+        dump(results, outfile, indent = 4)
+
+    for name, stats in results['timings'].items():
+        print(f"{name:>16}  mean {stats['mean']:6.2f}  p50 {stats['p50']:6.2f}  p95 {stats['p95']:6.2f}  p99 {stats['p99']:6.2f}")
+    print(f"state {results['state']}")
+    print(f'results written to {args.out}')
@@ -0,0 +1,35 @@
+import pygame
+from settings import *
+
+class Compositor:
+    def __init__(self) -> None:
+        self.display_surface = pygame.display.get_surface()
+        self.full_surf = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+        self.fill_color = None
+        self.tints = {}
+
+    def set_tint(self, name, color) -> None:
+        self.tints[name] = color
+
+    def get_color(self) -> tuple:
+        # fuse every tint into a single multiply factor
+        color = [255, 255, 255]
+        for tint in self.tints.values():
+            for index in range(3):
+                color[index] = color[index] * tint[index] / 255
+        return tuple(int(value) for value in color)
+
+    def display(self) -> None:
+        color = self.get_color()
+        if color == (255, 255, 255):
+            return
+
+        # only refill the blend surface when the tint changed
+        if color != self.fill_color:
+            self.full_surf.fill(color)
+            self.fill_color = color
+
+        self.display_surface.blit(
+            source = self.full_surf, 
+            dest = (0, 0), 
+            special_flags = pygame.BLEND_RGBA_MULT)
@@ -0,0 +1,105 @@
+import pygame
+from settings import KEY_REPEAT_DELAY, KEY_REPEAT_INTERVAL
+from timer import game_clock
+
+# action name: keys bound to it
+BINDINGS = {
+    'up': [pygame.K_UP, pygame.K_w],
+    'down': [pygame.K_DOWN, pygame.K_s],
+    'left': [pygame.K_LEFT, pygame.K_a],
+    'right': [pygame.K_RIGHT, pygame.K_d],
+    'use tool': [pygame.K_SPACE],
+    'switch tool': [pygame.K_q],
+    'use seed': [pygame.K_LALT, pygame.K_RALT],
+    'switch seed': [pygame.K_e],
+    'interact': [pygame.K_RETURN],
+    'inventory': [pygame.K_i],
+    'confirm': [pygame.K_SPACE, pygame.K_RETURN],
+    'back': [pygame.K_ESCAPE]
+}
+ACTION_BITS = {action: 1 << index for index, action in enumerate(BINDINGS)}
+
+class Controls:
+    def __init__(self, bindings = BINDINGS) -> None:
+        self.bindings = bindings
+        self.key_actions = {}
+        for action, keys in bindings.items():
+            for key in keys:
+                self.key_actions.setdefault(key, []).append(action)
+
+        # held keys and actions, plus the edges since the last simulation step
+        self.keys = set()
+        self.held_actions = set()
+        self.pressed_actions = set()
+        self.released_actions = set()
+
+        # next repeat time of held actions polled through repeated
+        self.repeats = {}
+
+    def press(self, key) -> None:
+        if key in self.keys:
+            return
+        self.keys.add(key)
+        for action in self.key_actions.get(key, []):
+            if action not in self.held_actions:
+                self.held_actions.add(action)
+                self.pressed_actions.add(action)
+
+    def release(self, key) -> None:
+        if key not in self.keys:
+            return
+        self.keys.discard(key)
+        for action in self.key_actions.get(key, []):
+            # an action stays held while any of its keys is down
+            if not any(bound in self.keys for bound in self.bindings[action]):
+                self.held_actions.discard(action)
+                self.released_actions.add(action)
+
+    def handle_event(self, event) -> None:
+        if event.type == pygame.KEYDOWN:
+            self.press(event.key)
+        elif event.type == pygame.KEYUP:
+            self.release(event.key)
+        elif event.type == pygame.WINDOWFOCUSLOST:
+            # key ups are not delivered to an unfocused window
+            for key in list(self.keys):
+                self.release(key)
+
+    def held(self, action) -> bool:
+        return action in self.held_actions
+
+    def pressed(self, action) -> bool:
+        return action in self.pressed_actions
+
+    def released(self, action) -> bool:
+        return action in self.released_actions
+
+    def repeated(self, action, delay = KEY_REPEAT_DELAY, interval = KEY_REPEAT_INTERVAL) -> bool:
+        # fires on the press, then keeps firing while held; timed by the
+        # simulated clock so replays repeat on the same steps
+        current_time = game_clock.get_ticks()
+        if self.pressed(action):
+            self.repeats[action] = current_time + delay
+            return True
+        if not self.held(action):
+            self.repeats.pop(action, None)
+            return False
+        if action in self.repeats and current_time >= self.repeats[action]:
+            self.repeats[action] += interval
+            return True
+        return False
+
+    def end_step(self) -> None:
+        # edges are consumed by exactly one simulation step
+        self.pressed_actions.clear()
+        self.released_actions.clear()
+
+    def get_state(self) -> tuple:
+        return tuple(
+            sum(ACTION_BITS[action] for action in actions)
+            for actions in (self.held_actions, self.pressed_actions, self.released_actions))
+
+    def set_state(self, held, pressed, released) -> None:
+        self.held_actions = {action for action, bit in ACTION_BITS.items() if held & bit}
+        self.pressed_actions = {action for action, bit in ACTION_BITS.items() if pressed & bit}
+        self.released_actions = {action for action, bit in ACTION_BITS.items() if released & bit}
@@ -1,7 +1,7 @@
 import pygame
 from settings import *
-from support import *
-from random import randint
+from assets import assets
+from rng import rng
 from timer import Timer
 
 class Cow(pygame.sprite.Sprite):
@@ -23,9 +23,10 @@ class Cow(pygame.sprite.Sprite):
         self.z = LAYERS['main']
 
         # movement attributes
+        self.random = rng.get('cows')
         self.direction = pygame.math.Vector2()
-        self.direction.x = randint(-1, 1)
-        self.direction.y = randint(-1, 1)
+        self.direction.x = self.random.randint(-1, 1)
+        self.direction.y = self.random.randint(-1, 1)
         self.pos = pygame.math.Vector2(self.rect.center)
         self.speed = 50
 
@@ -55,7 +56,7 @@ class Cow(pygame.sprite.Sprite):
 
         for animation in self.animations.keys():
             full_path = '../graphics/cow/' + animation
-            self.animations[animation] = import_folder(full_path)
+            self.animations[animation] = assets.folder(full_path)
 
     def animate(self, dt):
         self.frame_index += 4 * dt
@@ -80,38 +81,38 @@ class Cow(pygame.sprite.Sprite):
         self.hitbox.centery = round(self.pos.y)
         self.rect.centery = self.hitbox.centery
         self.collision('vertical')
+        self.collision_sprites.refresh(self)
 
     def update_timers(self):
         for timer in self.timers.values():
             timer.update()
 
     def collision(self, direction):
-        for sprite in self.collision_sprites.sprites():
-            if sprite != self and hasattr(sprite, 'hitbox'):
-                if sprite.hitbox.colliderect(self.hitbox):
-                    if ANALYTICS and COW:
-                        print('cow collision!')
-
-                    if direction == 'horizontal':
-                        if self.direction.x > 0: # moving right
-                            self.hitbox.right = sprite.hitbox.left
-                        if self.direction.x < 0: # moving left
-                            self.hitbox.left = sprite.hitbox.right
-                        self.rect.centerx = self.hitbox.centerx
-                        self.pos.x = self.hitbox.centerx
-
-                    if direction == 'vertical':
-                        if self.direction.y > 0: # moving down
-                            self.hitbox.bottom = sprite.hitbox.top
-                        if self.direction.y < 0: # moving up
-                            self.hitbox.top = sprite.hitbox.bottom
-                        self.rect.centery = self.hitbox.centery
-                        self.pos.y = self.hitbox.centery
+        for hitbox in self.collision_sprites.get_hitboxes(self.hitbox, exclude = self):
+            if hitbox.colliderect(self.hitbox):
+                if ANALYTICS and COW:
+                    print('cow collision!')
+
+                if direction == 'horizontal':
+                    if self.direction.x > 0: # moving right
+                        self.hitbox.right = hitbox.left
+                    if self.direction.x < 0: # moving left
+                        self.hitbox.left = hitbox.right
+                    self.rect.centerx = self.hitbox.centerx
+                    self.pos.x = self.hitbox.centerx
+
+                if direction == 'vertical':
+                    if self.direction.y > 0: # moving down
+                        self.hitbox.bottom = hitbox.top
+                    if self.direction.y < 0: # moving up
+                        self.hitbox.top = hitbox.bottom
+                    self.rect.centery = self.hitbox.centery
+                    self.pos.y = self.hitbox.centery
 
     def get_status(self):
         # set action
         rand_max = 100
-        x = randint(0, rand_max)
+        x = self.random.randint(0, rand_max)
         if x < 40:
             self.status = 'idle_'
         elif x < 60:
@@ -121,8 +122,8 @@ class Cow(pygame.sprite.Sprite):
         else:
             self.status = 'walk_'
             while True:
-                self.direction.x = randint(-1, 1)
-                self.direction.y = randint(-1, 1)
+                self.direction.x = self.random.randint(-1, 1)
+                self.direction.y = self.random.randint(-1, 1)
                 if self.direction.magnitude != 0:
                     break
         
@@ -131,7 +132,7 @@ class Cow(pygame.sprite.Sprite):
             self.status += 'left'
         elif self.direction.x == 1:
             self.status += 'right'
-        elif randint(0, 1) == 0:
+        elif self.random.randint(0, 1) == 0:
             self.status += 'right'
         else:
             self.status += 'left'
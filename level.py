@@ -1,80 +1,104 @@
 import pygame
 import pickle
+from bisect import bisect_left, bisect_right
+from math import floor
 from settings import *
 from player import Player
 from overlay import Overlay
-from sprites import Generic, Water, WildFlower, Tree, Interaction, Particle
-from pytmx.util_pygame import load_pygame
+from sprites import Generic, Water, WildFlower, Tree, Interaction, Orchard, particle_pool
+from tilemap import load_map
 from support import *
 from transition import Transition
+from compositor import Compositor
 from soil import SoilLayer
 from sky import Rain, Sky
 from menu import Menu, Inventory
-from random import randint
-from time import sleep
+from rng import rng
 from cow import Cow
+from timer import AnimationClock, game_clock
+from spatial import SpatialGrid
 from json import dump, load
+from assets import assets
+from profiler import profiler
 
 
 class Level:
-    def __init__(self):
+    def __init__(self, controls, load_game):
         # get display surface
         self.display_surface = pygame.display.get_surface()
 
+        # action input, fed from events (scripted in benchmarks, replays)
+        self.controls = controls
+
+        # continue from the save files or start a new farm
+        self.load_game = load_game
+
         # sprite groups
         self.all_sprites = CameraGroup()
-        self.collision_sprites = pygame.sprite.Group()
+        self.collision_sprites = CollisionGroup()
         self.tree_sprites = pygame.sprite.Group()
         self.interaction_sprites = pygame.sprite.Group()
         self.cow_sprites = pygame.sprite.Group()
 
         # setup
-        self.soil_layer = SoilLayer(self.all_sprites, self.collision_sprites)
+        self.soil_layer = SoilLayer(self.all_sprites, self.collision_sprites, self.load_game)
         self.setup()
         self.overlay = Overlay(self.player)
-        self.transition = Transition(self.reset, self.player)
+        self.compositor = Compositor()
+        self.transition = Transition(self.reset, self.player, self.compositor)
 
         # sky
         self.rain = Rain(self.all_sprites)
-        self.raining = True if RAIN_MODE else randint(0, 10) < 3
+        self.weather = rng.get('weather')
+        self.raining = True if RAIN_MODE else self.weather.randint(0, 10) < 3
         self.soil_layer.raining = self.raining
-        self.sky = Sky()
+        self.set_weather_tint()
+        self.sky = Sky(self.compositor)
 
         # shop
         self.shop_active = False
         self.menu = Menu(
             player = self.player,
-            toggle_menu = self.toggle_shop
+            toggle_menu = self.toggle_shop,
+            controls = self.controls
         )
 
         # inventory menu
         self.inventory_active = False
         self.inventory = Inventory(
             player = self.player,
-            toggle_inventory = self.toggle_inventory
+            toggle_inventory = self.toggle_inventory,
+            controls = self.controls
         )
 
+        # frozen world frame behind open menus
+        self.backdrop = None
+
         # import audio
-        self.success = pygame.mixer.Sound('../audio/success.wav')
+        self.success = assets.sound('../audio/success.wav')
         self.success.set_volume(0.3 * MASTER_VOL)
-        self.music = pygame.mixer.Sound('../audio/music.mp3')
+        self.music = assets.sound('../audio/music.mp3')
         self.music.set_volume(0.1 * MASTER_VOL)
         self.music.play(loops = -1)
 
     def setup(self):
         # import tiled map 
-        tmx_data = load_pygame('../data/map.tmx')
+        tmx_data = load_map()
 
         # load assets from tiled map:
-        # house bottom
-        for layer in ['HouseFloor', 'HouseFurnitureBottom']:
-            for x, y, surf in tmx_data.get_layer_by_name(layer).tiles():
-                Generic(
-                    pos = (x * TILE_SIZE, y * TILE_SIZE), 
-                    surf = surf, 
-                    groups = self.all_sprites, 
-                    z = LAYERS['house bottom']
-                )
+        # house bottom (baked into static chunks)
+        house_bottom = [
+            ((x * TILE_SIZE, y * TILE_SIZE), surf)
+            for layer in ['HouseFloor', 'HouseFurnitureBottom']
+            for x, y, surf in tmx_data.get_layer_by_name(layer).tiles()
+        ]
+        for pos, surf in bake_chunks(house_bottom).items():
+            Generic(
+                pos = pos, 
+                surf = surf, 
+                groups = self.all_sprites, 
+                z = LAYERS['house bottom']
+            )
 
         # house top
         for layer in ['HouseWalls', 'HouseFurnitureTop']:
@@ -91,16 +115,20 @@ class Level:
             Generic(
                 pos = (x * TILE_SIZE, y * TILE_SIZE), 
                 surf = surf, 
-                groups = [self.all_sprites, self.collision_sprites], 
+                groups = self.all_sprites, 
                 z = LAYERS['main']
             )
 
-        # water
-        water_frames = import_folder('../graphics/water')
-        for x, y, surf in tmx_data.get_layer_by_name('Water').tiles():
+        # water (one baked chunk per animation frame)
+        water_frames = assets.folder('../graphics/water')
+        water_tiles = [(x * TILE_SIZE, y * TILE_SIZE) for x, y, surf in tmx_data.get_layer_by_name('Water').tiles()]
+        water_chunks = [bake_chunks((pos, frame) for pos in water_tiles) for frame in water_frames]
+        self.water_clock = AnimationClock(len(water_frames), 5)
+        for pos in water_chunks[0]:
             Water(
-                pos = (x * TILE_SIZE, y * TILE_SIZE),
-                frames = water_frames,
+                pos = pos,
+                frames = [chunks[pos] for chunks in water_chunks],
+                clock = self.water_clock,
                 groups = self.all_sprites
             )
 
@@ -113,6 +141,7 @@ class Level:
                 name = obj.name,
                 player_add = self.player_add
             )
+        self.orchard = Orchard(self.tree_sprites)
 
         # wildflowers
         for obj in tmx_data.get_layer_by_name('Decoration'):
@@ -122,13 +151,8 @@ class Level:
                 groups = [self.all_sprites, self.collision_sprites]
             )
 
-        # collision tiles
-        for x, y, surf in tmx_data.get_layer_by_name('Collision').tiles():
-            Generic(
-                pos = (x * TILE_SIZE, y * TILE_SIZE),
-                surf = pygame.Surface((TILE_SIZE, TILE_SIZE)),
-                groups = self.collision_sprites
-            )
+        # collision and fence tiles as one walkability grid
+        self.collision_sprites.set_blocked(tmx_data.get_blocked(['Collision', 'Fence']))
 
         # player
         for obj in tmx_data.get_layer_by_name('Player'):
@@ -141,7 +165,9 @@ class Level:
                     interaction_sprites = self.interaction_sprites,
                     soil_layer = self.soil_layer,
                     toggle_shop = self.toggle_shop,
-                    toggle_inventory = self.toggle_inventory
+                    toggle_inventory = self.toggle_inventory,
+                    controls = self.controls,
+                    load_game = self.load_game
                 )
 
             if obj.name == 'Bed':
@@ -167,21 +193,22 @@ class Level:
                     collision_sprites = self.collision_sprites
                 )
         
-        # ground
-        Generic(
-            pos = (0, 0),
-            surf = pygame.image.load('../graphics/world/ground.png').convert_alpha(),
-            groups = self.all_sprites,
-            z = LAYERS['ground']
-        )
+        # ground (baked into static chunks)
+        ground_surf = assets.image('../graphics/world/ground.png')
+        for pos, surf in bake_chunks([((0, 0), ground_surf)]).items():
+            Generic(
+                pos = pos,
+                surf = surf,
+                groups = self.all_sprites,
+                z = LAYERS['ground']
+            )
+        assets.unload('../graphics/world/ground.png')
 
     def toggle_shop(self):
         self.shop_active = not self.shop_active
-        sleep(0.1)
 
     def toggle_inventory(self):
         self.inventory_active = not self.inventory_active
-        sleep(0.2)
 
     def player_add(self, item):
         # update inventory
@@ -195,57 +222,37 @@ class Level:
             dump(self.player.item_inventory, outfile)
 
     def reset(self):
-        # grow plants
-        self.soil_layer.update_plants()
-
-        # tree apples
-        for tree in self.tree_sprites.sprites():
-            for apple in tree.apple_sprites.sprites():
-                apple.kill()
-            tree.create_fruit()
-
-        # soil water
-        self.soil_layer.remove_water()
-
         # randomize rain
-        self.raining = True if RAIN_MODE else randint(0, 10) < 3
+        self.raining = True if RAIN_MODE else self.weather.randint(0, 10) < 3
         self.soil_layer.raining = self.raining
-        if self.raining:
-            self.soil_layer.water_all()
+        self.set_weather_tint()
+
+        # crops, soil water and tree apples for the new day, in bulk
+        self.soil_layer.advance_day(self.raining)
+        self.orchard.respawn()
 
         # daylight
         self.sky.start_color = [255, 255, 255]
 
+    def set_weather_tint(self):
+        self.compositor.set_tint('weather', RAIN_TINT if self.raining else (255, 255, 255))
+
     def plant_collision(self):
-        if self.soil_layer.plant_sprites:
-            for plant in self.soil_layer.plant_sprites.sprites():
-                if plant.harvestable and plant.rect.colliderect(self.player.hitbox):
-                    # update inventory
-                    self.player_add(plant.type)
-                    if ANALYTICS and INVENTORY:
-                        print(self.player.item_inventory)
-
-                    # remove plant + create particle
-                    plant.kill()
-                    Particle(
-                        pos = plant.rect.topleft,
-                        surf = plant.image,
-                        groups = self.all_sprites,
-                        z = LAYERS['main']
-                    )
-
-                    # update soil tile data
-                    row = plant.rect.centery // TILE_SIZE
-                    col = plant.rect.centerx // TILE_SIZE
-                    try:
-                        self.soil_layer.grid[row][col].remove('C')
-                    except:
-                        print('no corn to remove')
-
-                    try:
-                        self.soil_layer.grid[row][col].remove('T')
-                    except:
-                        print('no tomato to remove')
+        for plant in self.soil_layer.get_harvestable(self.player.hitbox):
+            if plant.rect.colliderect(self.player.hitbox):
+                # remove plant + create particle
+                self.soil_layer.harvest(plant)
+                particle_pool.get(
+                    pos = plant.rect.topleft,
+                    surf = plant.image,
+                    groups = self.all_sprites,
+                    z = LAYERS['main']
+                )
+
+                # update inventory
+                self.player_add(plant.type)
+                if ANALYTICS and INVENTORY:
+                    print(self.player.item_inventory)
 
     def cow_collision(self):
         for cow in self.cow_sprites.sprites():
@@ -254,34 +261,125 @@ class Level:
                 cow.status = 'love_' 
                 cow.status += 'left' if cow.direction == -1 else 'right'
 
-    def run(self, dt):
-        # load background and sprites
-        self.display_surface.fill('black')
-        self.all_sprites.custom_draw(self.player)
-        
-        # updates
-        if self.shop_active:
-            self.menu.update()
-        elif self.inventory_active:
-            self.inventory.update()
-        else:    
+    @property
+    def menu_active(self):
+        return self.shop_active or self.inventory_active
+
+    def update(self, dt):
+        # one simulation step
+        game_clock.advance(dt)
+
+        # the world is paused behind open menus, only daylight keeps moving
+        if self.menu_active:
+            menu = self.menu if self.shop_active else self.inventory
+            menu.input()
+            self.sky.update(dt)
+            return
+
+        with profiler.section('update'):
             self.all_sprites.update(dt)
+            self.water_clock.update(dt)
+        with profiler.section('rain'):
+            self.rain.update(dt, self.raining, self.player)
+        with profiler.section('plant collision'):
             self.plant_collision()
+        with profiler.section('cow collision'):
             self.cow_collision()
 
+        with profiler.section('sky'):
+            # daylight
+            self.sky.update(dt)
+
+            # transition
+            if self.player.sleep:
+                self.transition.play()
+
+    def draw(self):
+        # menus only redraw their changed entries over a frozen world frame
+        if self.menu_active:
+            menu = self.menu if self.shop_active else self.inventory
+            if self.backdrop is None:
+                self.backdrop = self.display_surface.copy()
+                menu.open(self.backdrop)
+            return menu.draw()
+        self.backdrop = None
+
+        # load background and sprites
+        self.display_surface.fill('black')
+        with profiler.section('draw'):
+            self.all_sprites.custom_draw(self.player)
+
         # HUD
         self.overlay.display()
 
-        # rain
-        if self.raining and not self.shop_active:
-            self.rain.update()
+        # day, sleep and weather tints in a single blend
+        with profiler.section('sky'):
+            self.compositor.display()
 
-        # daylight
-        self.sky.display(dt)
+    def run(self, dt):
+        # single step and draw, used by the benchmark
+        self.update(dt)
+        return self.draw()
 
-        # transition
-        if self.player.sleep:
-            self.transition.play()
+class CollisionGroup(pygame.sprite.Group):
+    def __init__(self):
+        super().__init__()
+
+        # broadphase over hitboxes: static ones are indexed once, movers refresh themselves
+        self.grid = SpatialGrid(COLLISION_CELL_SIZE)
+        self.pending = []
+        self.order = {}
+        self.count = 0
+
+        # static walls are whole tiles, True where blocked
+        self.blocked = None
+
+    def add_internal(self, sprite, layer = None):
+        super().add_internal(sprite, layer)
+        # hitboxes are assigned after the sprite joins its groups
+        self.pending.append(sprite)
+        self.order[sprite] = self.count
+        self.count += 1
+
+    def remove_internal(self, sprite):
+        super().remove_internal(sprite)
+        self.grid.remove(sprite)
+        self.order.pop(sprite, None)
+
+    def flush(self):
+        for sprite in self.pending:
+            self.refresh(sprite)
+        self.pending.clear()
+
+    def refresh(self, sprite):
+        # sprites without a hitbox yet (seedlings) are indexed once they get one
+        if sprite in self.spritedict and hasattr(sprite, 'hitbox'):
+            self.grid.move(sprite, sprite.hitbox)
+
+    def query(self, rect):
+        # candidates near rect, in the order they joined the group
+        self.flush()
+        return sorted(self.grid.query(rect), key = self.order.get)
+
+    def set_blocked(self, blocked):
+        self.blocked = blocked
+
+    def get_hitboxes(self, rect, exclude = None):
+        hitboxes = []
+
+        # blocked tiles under rect
+        if self.blocked is not None:
+            rows, cols = self.blocked.shape
+            for y in range(max(0, rect.top // TILE_SIZE), min(rows, (rect.bottom - 1) // TILE_SIZE + 1)):
+                for x in range(max(0, rect.left // TILE_SIZE), min(cols, (rect.right - 1) // TILE_SIZE + 1)):
+                    if self.blocked[y, x]:
+                        hitboxes.append(pygame.Rect(x * TILE_SIZE, y * TILE_SIZE, TILE_SIZE, TILE_SIZE))
+
+        # sprites: trees, flowers, cows and grown plants
+        for sprite in self.query(rect):
+            if sprite is not exclude:
+                hitboxes.append(sprite.hitbox)
+        return hitboxes
 
 class CameraGroup(pygame.sprite.Group):
     def __init__(self):
@@ -289,39 +387,169 @@ class CameraGroup(pygame.sprite.Group):
         self.display_surface = pygame.display.get_surface()
         self.offset = pygame.math.Vector2()
 
+        # spatial index for culling the dynamic layers
+        self.grid = SpatialGrid(CHUNK_SIZE)
+        self.pending = []
+        self.active = {}
+        self.order = {}
+        self.count = 0
+
+        # render queue: sprites bucketed by z. static buckets stay y-sorted
+        # between frames, dynamic buckets are refilled from the grid and
+        # sorted every frame
+        self.layers = {layer: [] for layer in LAYERS.values()}
+        self.dynamic_layers = {LAYERS[name] for name in DYNAMIC_LAYERS}
+        self.sprite_layers = {}
+        self.dirty_layers = set()
+
+        # sort keys and half the tallest sprite of each static bucket,
+        # used to find the rows that can reach the camera
+        self.keys = {layer: [] for layer in LAYERS.values()}
+        self.reach = dict.fromkeys(LAYERS.values(), 0)
+
+        # batched draw callbacks for layers that are not made of sprites
+        self.renderers = {layer: [] for layer in LAYERS.values()}
+
+    def add_internal(self, sprite, layer = None):
+        super().add_internal(sprite, layer)
+        # rect and z are usually assigned after the sprite joins its groups,
+        # so bucketing waits until the next update or draw
+        self.pending.append(sprite)
+
+    def remove_internal(self, sprite):
+        super().remove_internal(sprite)
+        self.unstack(sprite)
+        self.active.pop(sprite, None)
+        self.order.pop(sprite, None)
+
+    def stack(self, sprite):
+        self.sprite_layers[sprite] = sprite.z
+        if sprite.z in self.dynamic_layers:
+            self.grid.insert(sprite, sprite.rect)
+        else:
+            self.layers[sprite.z].append(sprite)
+            self.dirty_layers.add(sprite.z)
+
+    def unstack(self, sprite):
+        layer = self.sprite_layers.pop(sprite, None)
+        if layer in self.dynamic_layers:
+            self.grid.remove(sprite)
+        elif layer is not None:
+            self.dirty_layers.add(layer)
+
+    def restack(self, sprite):
+        # move a sprite whose z changed into its new bucket
+        self.unstack(sprite)
+        self.pending.append(sprite)
+
+    def flush(self):
+        for sprite in self.pending:
+            if sprite in self.spritedict and sprite not in self.sprite_layers:
+                if sprite not in self.order:
+                    self.order[sprite] = self.count
+                    self.count += 1
+
+                    # only sprites with their own update can move by themselves
+                    if type(sprite).update is not pygame.sprite.Sprite.update:
+                        self.active[sprite] = None
+                self.stack(sprite)
+        self.pending.clear()
+
+    def sort_layers(self):
+        # static buckets only need sorting when their contents change
+        for layer in self.dirty_layers:
+            bucket = [sprite for sprite in dict.fromkeys(self.layers[layer]) if self.sprite_layers.get(sprite) == layer]
+            bucket.sort(key = lambda sprite: (sprite.rect.centery, self.order[sprite]))
+            self.layers[layer] = bucket
+            self.keys[layer] = [sprite.rect.centery for sprite in bucket]
+            self.reach[layer] = max((sprite.rect.height for sprite in bucket), default = 0) // 2 + 1
+        self.dirty_layers.clear()
+
+    def cull(self, layer, camera_rect):
+        # walk the sorted bucket between the first and last rows that can reach the camera
+        keys = self.keys[layer]
+        reach = self.reach[layer]
+        start = bisect_left(keys, camera_rect.top - reach)
+        end = bisect_right(keys, camera_rect.bottom + reach, start)
+        return [sprite for sprite in self.layers[layer][start:end] if sprite.rect.colliderect(camera_rect)]
+
+    def add_renderer(self, layer, renderer):
+        self.renderers[layer].append(renderer)
+
+    def refresh(self, sprite):
+        # re-index a sprite whose rect changed outside of update
+        layer = self.sprite_layers.get(sprite)
+        if layer in self.dynamic_layers:
+            self.grid.move(sprite, sprite.rect)
+        elif layer is not None:
+            self.dirty_layers.add(layer)
+
+    def update(self, dt):
+        self.flush()
+        for sprite in list(self.active):
+            sprite.update(dt)
+            if self.sprite_layers.get(sprite) in self.dynamic_layers:
+                self.grid.move(sprite, sprite.rect)
+
+    def get_offset(self, target) -> pygame.math.Vector2:
+        # the camera keeps its target centred on screen
+        return pygame.math.Vector2(target.rect.centerx - SCREEN_WIDTH / 2, target.rect.centery - SCREEN_HEIGHT / 2)
+
     def custom_draw(self, player):
-        self.offset.x = player.rect.centerx - SCREEN_WIDTH / 2
-        self.offset.y = player.rect.centery - SCREEN_HEIGHT / 2
-        
-        for layer in LAYERS.values():    
-            for sprite in sorted(self.sprites(), key = lambda sprite: sprite.rect.centery):
-                if sprite.z == layer:
-                    offset_rect = sprite.rect.copy()
-                    offset_rect.center -= self.offset
-                    self.display_surface.blit(sprite.image, offset_rect)
-
-                    # hitbox analytics
-                    if ANALYTICS and HITBOX:
-                        # player
-                        if sprite == player:
-                            pygame.draw.rect(
-                                self.display_surface, 
-                                'red', 
-                                offset_rect, 
-                                5
-                            )
-                            hitbox_rect = player.hitbox.copy()
-                            hitbox_rect.center = offset_rect.center
-                            pygame.draw.rect(
-                                self.display_surface, 
-                                'green', 
-                                hitbox_rect, 
-                                5
-                            )
-                            target_pos = offset_rect.center + PLAYER_TOOL_OFFSET[player.status.split('_')[0]]
-                            pygame.draw.circle(
-                                self.display_surface,
-                                'blue',
-                                target_pos,
-                                5
-                            )
+        self.offset.update(self.get_offset(player))
+        offset_x, offset_y = self.offset
+        self.flush()
+        self.sort_layers()
+
+        # cull to the camera rectangle, widened to cover the fractional offset
+        camera_rect = pygame.Rect(floor(offset_x), floor(offset_y), SCREEN_WIDTH + 1, SCREEN_HEIGHT + 1)
+        for sprite in self.grid.query(camera_rect):
+            if sprite.rect.colliderect(camera_rect):
+                self.layers[self.sprite_layers[sprite]].append(sprite)
+
+        for layer, bucket in self.layers.items():
+            if layer in self.dynamic_layers:
+                bucket.sort(key = lambda sprite: (sprite.rect.centery, self.order[sprite]))
+                visible = bucket
+            else:
+                visible = self.cull(layer, camera_rect)
+
+            for sprite in visible:
+                if sprite.z != layer:
+                    self.restack(sprite)
+                    continue
+
+                self.display_surface.blit(sprite.image, (sprite.rect.x - offset_x, sprite.rect.y - offset_y))
+
+                # hitbox analytics
+                if ANALYTICS and HITBOX:
+                    # player
+                    if sprite == player:
+                        offset_rect = sprite.rect.copy()
+                        offset_rect.center -= self.offset
+                        pygame.draw.rect(
+                            self.display_surface, 
+                            'red', 
+                            offset_rect, 
+                            5
+                        )
+                        hitbox_rect = player.hitbox.copy()
+                        hitbox_rect.center = offset_rect.center
+                        pygame.draw.rect(
+                            self.display_surface, 
+                            'green', 
+                            hitbox_rect, 
+                            5
+                        )
+                        target_pos = offset_rect.center + PLAYER_TOOL_OFFSET[player.status.split('_')[0]]
+                        pygame.draw.circle(
+                            self.display_surface,
+                            'blue',
+                            target_pos,
+                            5
+                        )
+
+            if layer in self.dynamic_layers:
+                bucket.clear()
+            for renderer in self.renderers[layer]:
+                renderer(self.offset)
@@ -0,0 +1,116 @@
+import pygame, sys
+from time import perf_counter
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from settings import *
+from support import read_folder
+from assets import assets
+from text import text_renderer
+from tilemap import load_map
+from level import Level
+
+# everything the level loads at startup
+FOLDERS = (
+    ['../graphics/character/' + direction + action 
+        for direction in ['up', 'down', 'left', 'right'] 
+        for action in ['', '_idle', '_hoe', '_axe', '_water']] +
+    ['../graphics/cow/' + action + side 
+        for action in ['idle_', 'walk_', 'sit_', 'eat_', 'love_'] 
+        for side in ['left', 'right']] +
+    ['../graphics/water', '../graphics/soil/', '../graphics/soil_water/',
+     '../graphics/rain/drops/', '../graphics/rain/floor/',
+     '../graphics/fruit/corn', '../graphics/fruit/tomato']
+)
+IMAGES = (
+    [f'../graphics/overlay/{name}.png' for name in ['hoe', 'axe', 'water', 'corn_seed', 'tomato_seed']] +
+    ['../graphics/stumps/small.png', '../graphics/stumps/large.png', 
+     '../graphics/fruit/apple.png', '../graphics/world/ground.png']
+)
+SOUNDS = [
+    '../audio/success.wav', '../audio/music.mp3', '../audio/axe.mp3', 
+    '../audio/water.mp3', '../audio/hoe.wav', '../audio/plant.wav'
+]
+
+class Loader:
+    def __init__(self) -> None:
+        self.display_surface = pygame.display.get_surface()
+        self.font = text_renderer.get_font('../font/LycheeSoda.ttf', 30)
+        self.timings = {}
+        self.progress = 0
+
+    def log_stage(self, name, seconds) -> None:
+        self.timings[name] = seconds
+        if ANALYTICS and LOADING:
+            print(f'{name}: {self.timings[name] * 1000:.1f} ms')
+
+    def display(self, label) -> None:
+        # keep the window responsive while loading
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                pygame.quit()
+                sys.exit()
+
+        self.display_surface.fill('black')
+        text_surf = text_renderer.render(self.font, label, False, 'White')
+        text_rect = text_surf.get_rect(midbottom = (SCREEN_WIDTH / 2, SCREEN_HEIGHT / 2 - 20))
+        self.display_surface.blit(text_surf, text_rect)
+
+        bar_rect = pygame.Rect(0, 0, 400, 24)
+        bar_rect.center = (SCREEN_WIDTH / 2, SCREEN_HEIGHT / 2 + 10)
+        fill_rect = bar_rect.copy()
+        fill_rect.width = int(bar_rect.width * self.progress)
+        pygame.draw.rect(self.display_surface, 'White', fill_rect, 0, 6)
+        pygame.draw.rect(self.display_surface, 'White', bar_rect, 2, 6)
+        pygame.display.update()
+
+    def load_assets(self) -> None:
+        # decode files in worker threads, convert on the main thread
+        start = perf_counter()
+        convert_time = 0
+        with ThreadPoolExecutor() as executor:
+            jobs = {}
+            for path in FOLDERS:
+                jobs[executor.submit(read_folder, path)] = (assets.store_folder, path)
+            for path in IMAGES:
+                jobs[executor.submit(pygame.image.load, path)] = (assets.store_image, path)
+            for path in SOUNDS:
+                jobs[executor.submit(pygame.mixer.Sound, path)] = (assets.store_sound, path)
+
+            pending = set(jobs)
+            while pending:
+                done, pending = wait(pending, timeout = 1 / 30, return_when = FIRST_COMPLETED)
+                convert_start = perf_counter()
+                for job in done:
+                    store, path = jobs[job]
+                    result = job.result()
+                    # folders decode to (sheet, frames)
+                    if isinstance(result, tuple):
+                        store(path, *result)
+                    else:
+                        store(path, result)
+                convert_time += perf_counter() - convert_start
+
+                self.progress = 0.8 * (len(jobs) - len(pending)) / len(jobs)
+                self.display('Loading assets')
+
+        self.log_stage('convert', convert_time)
+        self.log_stage('assets', perf_counter() - start)
+
+    def load(self, controls, load_game) -> Level:
+        start = perf_counter()
+        self.display('Loading')
+        self.load_assets()
+
+        # map
+        stage_start = perf_counter()
+        load_map()
+        self.progress = 0.9
+        self.log_stage('map', perf_counter() - stage_start)
+        self.display('Building farm')
+
+        # level (assets and map are cached by now)
+        stage_start = perf_counter()
+        level = Level(controls, load_game)
+        self.progress = 1
+        self.log_stage('level', perf_counter() - stage_start)
+        self.log_stage('total', perf_counter() - start)
+        return level
@@ -1,11 +1,18 @@
 # 1763 Lines of code
 import pygame, sys
 from settings import *
-from level import Level
+from loader import Loader
+from overlay import PerfOverlay
+from profiler import profiler
+from time import perf_counter
+from controls import Controls
+from replay import Recorder, Replayer, read_saves, write_saves, get_state_digest
+from rng import rng
+from argparse import ArgumentParser
 import os
 
 class Game:
-    def __init__(self):
+    def __init__(self, record = None, replay = None, seed = None):
         x = 0
         y = 28
         os.environ['SDL_VIDEO_WINDOW_POS'] = "%d,%d" % (x,y)
@@ -13,20 +20,82 @@ class Game:
         self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
         pygame.display.set_caption("Cozy Acres: Bunny's Busy Burrow")
         self.clock = pygame.time.Clock()
-        self.level = Level()
+        self.accumulator = 0
+
+        # input recording / replay
+        self.recorder = None
+        self.replayer = None
+        self.backups = None
+        self.controls = Controls()
+        if replay:
+            self.replayer = Replayer(replay, self.controls)
+            self.backups = read_saves()
+            self.replayer.restore_saves()
+        elif record:
+            self.recorder = Recorder(record, self.controls, seed)
+        else:
+            rng.seed(seed)
+
+        self.level = Loader().load(self.controls, has_save())
+        self.perf_overlay = PerfOverlay(self.level)
+
+    def quit(self):
+        # write the farm to JSON
+        self.level.soil_layer.save()
+        if self.recorder:
+            self.recorder.save()
+        if self.replayer:
+            print(f'replayed {self.replayer.index} frames, state {get_state_digest(self.level)}')
+            write_saves(self.backups)
+        pygame.quit()
+        sys.exit()
+
+    def step(self):
+        dt = FIXED_DT
+        if self.replayer:
+            dt = self.replayer.begin_frame()
+            if dt is None:
+                self.quit()
+        elif self.recorder:
+            self.recorder.begin_frame(dt)
+        self.level.update(dt)
+        self.controls.end_step()
 
     def run(self):
         while True:
             for event in pygame.event.get():
                 if event.type == pygame.QUIT:
-                    # TODO: write save file
-                    pygame.quit()
-                    sys.exit()
+                    self.quit()
+                if event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+                    self.perf_overlay.toggle()
+                if not self.replayer:
+                    self.controls.handle_event(event)
 
-            dt = self.clock.tick() / 1000
-            self.level.run(dt)
-            pygame.display.update()
+            # throttle while nobody is playing
+            idle = self.level.menu_active or not pygame.key.get_focused()
+            frame_time = self.clock.tick(IDLE_FPS if idle else FPS_CAP) / 1000
+
+            # fixed steps, dropping time the simulation can't catch up on
+            start = perf_counter()
+            self.accumulator = min(self.accumulator + frame_time, MAX_STEPS * FIXED_DT)
+            while self.accumulator >= FIXED_DT:
+                self.accumulator -= FIXED_DT
+                self.step()
+
+            # None refreshes the whole window, menus return only their dirty rects
+            dirty_rects = self.level.draw()
+            perf_rect = self.perf_overlay.display(self.clock.get_fps())
+            if perf_rect and dirty_rects is not None:
+                dirty_rects.append(perf_rect)
+            pygame.display.update(dirty_rects)
+            profiler.end_frame(perf_counter() - start)
     
 if __name__ == '__main__':
-    game = Game()
+    parser = ArgumentParser(description = "Cozy Acres: Bunny's Busy Burrow")
+    parser.add_argument('--record', metavar = 'PATH', help = 'record input to a replay file')
+    parser.add_argument('--replay', metavar = 'PATH', help = 'play back a recorded replay file')
+    parser.add_argument('--seed', type = int, help = 'seed for every random stream')
+    args = parser.parse_args()
+
+    game = Game(args.record, args.replay, args.seed)
     game.run()
@@ -1,15 +1,16 @@
 import pygame
 from settings import *
-from timer import Timer
+from text import text_renderer
 from json import dump
 
 class Menu:
-    def __init__(self, player, toggle_menu) -> None:
+    def __init__(self, player, toggle_menu, controls) -> None:
         # general setup
         self.player = player
         self.toggle_menu = toggle_menu
+        self.controls = controls
         self.display_surface = pygame.display.get_surface()
-        self.font = pygame.font.Font('../font/LycheeSoda.ttf', 30)
+        self.font = text_renderer.get_font('../font/LycheeSoda.ttf', 30)
 
         # formatting
         self.width = 400
@@ -23,17 +24,37 @@ class Menu:
 
         # movement
         self.index = 0
-        self.timer = Timer(200)
 
-    def display_money(self):
-        text_surf = self.font.render(f'${self.player.money}', False, 'Black')
+    def open(self, backdrop):
+        # redraw everything over the frozen world frame
+        self.backdrop = backdrop
+        self.full_redraw = True
+        self.entry_states = {}
+        self.money_state = None
+        self.money_rect = None
+
+    def display_money(self) -> list:
+        if self.player.money == self.money_state:
+            return []
+
+        text_surf = text_renderer.render(self.font, f'${self.player.money}', False, 'Black')
         text_rect = text_surf.get_rect(midbottom = (SCREEN_WIDTH / 2, SCREEN_HEIGHT - 20))
+        bg_rect = text_rect.inflate(10, 10)
 
-        pygame.draw.rect(self.display_surface, 'White', text_rect.inflate(10, 10), 0, 6)
+        # restore the backdrop under the old amount
+        dirty_rect = bg_rect
+        if self.money_rect:
+            self.display_surface.blit(self.backdrop, self.money_rect, self.money_rect)
+            dirty_rect = bg_rect.union(self.money_rect)
+
+        pygame.draw.rect(self.display_surface, 'White', bg_rect, 0, 6)
         self.display_surface.blit(text_surf, text_rect)
+        self.money_state = self.player.money
+        self.money_rect = bg_rect
+        return [dirty_rect]
 
     def display_title(self):
-        text_surf = self.font.render('Shop', False, 'Black')
+        text_surf = text_renderer.render(self.font, 'Shop', False, 'Black')
         text_rect = text_surf.get_rect(midbottom = (SCREEN_WIDTH / 2, 90))
 
         pygame.draw.rect(self.display_surface, 'White', text_rect.inflate(10, 10), 0, 6)
@@ -47,7 +68,7 @@ class Menu:
         # add items to option list
         for item in self.options:
             item = item.replace('_', ' ')
-            text_surf = self.font.render(item, False, 'Black')
+            text_surf = text_renderer.render(self.font, item, False, 'Black')
             self.text_surfs.append(text_surf)
             self.height += text_surf.get_height() + self.padding * 2
 
@@ -58,53 +79,48 @@ class Menu:
         self.main_rect = pygame.Rect(self.menu_left, self.menu_top, self.width, self.height)
 
         # buy / sell 
-        self.buy_text = self.font.render('buy', False, '#000077')
-        self.sell_text = self.font.render('sell', False, '#000077')
+        self.buy_text = text_renderer.render(self.font, 'buy', False, '#000077')
+        self.sell_text = text_renderer.render(self.font, 'sell', False, '#000077')
 
     def input(self):
-        keys = pygame.key.get_pressed()
-        self.timer.update()
+        controls = self.controls
 
         # quit menu
-        if keys[pygame.K_ESCAPE]:
+        if controls.pressed('back'):
             self.toggle_menu()
-
-        # selected 
-        if not self.timer.active:
-            if keys[pygame.K_UP] or keys[pygame.K_w]: # up
-                self.index -= 1
-                self.timer.activate()
-
-            if keys[pygame.K_DOWN] or keys[pygame.K_s]: # down
-                self.index += 1
-                self.timer.activate()
-
-            if keys[pygame.K_SPACE] or keys[pygame.K_RETURN]: # buy / sell
-                self.timer.activate()
-
-                # get item
-                current_item = self.options[self.index]
-
-                # sell
-                if self.index <= self.sell_border:
-                    if self.player.item_inventory[current_item] > 0:
-                        self.player.item_inventory[current_item] -= 1
-                        self.player.money += SALE_PRICES[current_item]
-
-                # buy
-                else:
-                    seed_price = PURCHASE_PRICES[current_item]
-                    if self.player.money >= seed_price:
-                        self.player.seed_inventory[current_item] += 1
-                        self.player.money -= seed_price
-        
-        # save to JSON
-        with open("items.json", "w") as outfile:
-            dump(self.player.item_inventory, outfile)
-        with open("seeds.json", "w") as outfile:
-            dump(self.player.seed_inventory, outfile)
-        with open("money.json", "w") as outfile:
-            dump(self.player.money, outfile)
+            return
+
+        # selected, repeating while held
+        if controls.repeated('up'):
+            self.index -= 1
+
+        if controls.repeated('down'):
+            self.index += 1
+
+        if controls.pressed('confirm'): # buy / sell
+            # get item
+            current_item = self.options[self.index]
+
+            # sell
+            if self.index <= self.sell_border:
+                if self.player.item_inventory[current_item] > 0:
+                    self.player.item_inventory[current_item] -= 1
+                    self.player.money += SALE_PRICES[current_item]
+
+            # buy
+            else:
+                seed_price = PURCHASE_PRICES[current_item]
+                if self.player.money >= seed_price:
+                    self.player.seed_inventory[current_item] += 1
+                    self.player.money -= seed_price
+
+            # save to JSON
+            with open("items.json", "w") as outfile:
+                dump(self.player.item_inventory, outfile)
+            with open("seeds.json", "w") as outfile:
+                dump(self.player.seed_inventory, outfile)
+            with open("money.json", "w") as outfile:
+                dump(self.player.money, outfile)
         
         # control the selected index
         if self.index < 0:
@@ -115,6 +131,7 @@ class Menu:
     def show_entry(self, text_surf, amount, price, item_type, top, selected):
         # background
         bg_rect = pygame.Rect(self.main_rect.left, top, self.width, text_surf.get_height() + self.padding * 2)
+        self.display_surface.blit(self.backdrop, bg_rect, bg_rect)
         pygame.draw.rect(self.display_surface, 'White', bg_rect, 0, 6)
 
         # text
@@ -122,17 +139,17 @@ class Menu:
         self.display_surface.blit(text_surf, text_rect)
 
         # amount
-        amount_surf = self.font.render(str(amount), False, 'Black')
+        amount_surf = text_renderer.render(self.font, str(amount), False, 'Black')
         amount_rect = amount_surf.get_rect(midright = (self.main_rect.right - 65, bg_rect.centery))
         self.display_surface.blit(amount_surf, amount_rect)
 
         # price
         if item_type == 'sell': # sell
-            price_surf = self.font.render(f'${SALE_PRICES[str(price)]}', False, 'Black')
+            price_surf = text_renderer.render(self.font, f'${SALE_PRICES[str(price)]}', False, 'Black')
             price_rect = price_surf.get_rect(midright = (self.main_rect.right - 20, bg_rect.centery))
             self.display_surface.blit(price_surf, price_rect)
         elif item_type == 'buy': # buy
-            price_surf = self.font.render(f'${PURCHASE_PRICES[str(price)]}', False, 'Black')
+            price_surf = text_renderer.render(self.font, f'${PURCHASE_PRICES[str(price)]}', False, 'Black')
             price_rect = price_surf.get_rect(midright = (self.main_rect.right - 20, bg_rect.centery))
             self.display_surface.blit(price_surf, price_rect)
 
@@ -146,10 +163,18 @@ class Menu:
                 pos_rect = self.buy_text.get_rect(midleft = (self.main_rect.left + 200, bg_rect.centery))
                 self.display_surface.blit(self.buy_text, pos_rect)
 
-    def update(self):
-        self.input()
-        self.display_money()
-        self.display_title()
+        return bg_rect
+
+    def draw(self) -> list:
+        dirty_rects = []
+
+        # first frame: frozen world, title and every entry
+        if self.full_redraw:
+            self.display_surface.blit(self.backdrop, (0, 0))
+            self.display_title()
+            dirty_rects.append(self.display_surface.get_rect())
+            self.full_redraw = False
+        dirty_rects += self.display_money()
 
         for text_index, text_surf in enumerate(self.text_surfs):
             top = self.main_rect.top + text_index * (text_surf.get_height() + self.padding * 2 + self.space)
@@ -161,15 +186,23 @@ class Menu:
             price = price_list[text_index]
 
             item_type = 'sell' if text_index < 4 else 'buy'
-            self.show_entry(text_surf, amount, price, item_type, top, self.index == text_index)
+
+            # only redraw entries whose amount or selection changed
+            state = (amount, self.index == text_index)
+            if self.entry_states.get(text_index) != state:
+                self.entry_states[text_index] = state
+                dirty_rects.append(self.show_entry(text_surf, amount, price, item_type, top, self.index == text_index))
+
+        return dirty_rects
 
 class Inventory:
-    def __init__(self, player, toggle_inventory) -> None:
+    def __init__(self, player, toggle_inventory, controls) -> None:
         # general setup
         self.player = player
         self.toggle_inventory = toggle_inventory
+        self.controls = controls
         self.display_surface = pygame.display.get_surface()
-        self.font = pygame.font.Font('../font/LycheeSoda.ttf', 30)
+        self.font = text_renderer.get_font('../font/LycheeSoda.ttf', 30)
 
         # formatting
         self.width = 250
@@ -183,17 +216,37 @@ class Inventory:
 
         # movement
         self.index = 0
-        self.timer = Timer(200)
 
-    def display_money(self):
-        text_surf = self.font.render(f'${self.player.money}', False, 'Black')
+    def open(self, backdrop):
+        # redraw everything over the frozen world frame
+        self.backdrop = backdrop
+        self.full_redraw = True
+        self.entry_states = {}
+        self.money_state = None
+        self.money_rect = None
+
+    def display_money(self) -> list:
+        if self.player.money == self.money_state:
+            return []
+
+        text_surf = text_renderer.render(self.font, f'${self.player.money}', False, 'Black')
         text_rect = text_surf.get_rect(midbottom = (SCREEN_WIDTH / 2, SCREEN_HEIGHT - 20))
+        bg_rect = text_rect.inflate(10, 10)
 
-        pygame.draw.rect(self.display_surface, 'White', text_rect.inflate(10, 10), 0, 6)
+        # restore the backdrop under the old amount
+        dirty_rect = bg_rect
+        if self.money_rect:
+            self.display_surface.blit(self.backdrop, self.money_rect, self.money_rect)
+            dirty_rect = bg_rect.union(self.money_rect)
+
+        pygame.draw.rect(self.display_surface, 'White', bg_rect, 0, 6)
         self.display_surface.blit(text_surf, text_rect)
+        self.money_state = self.player.money
+        self.money_rect = bg_rect
+        return [dirty_rect]
 
     def display_title(self):
-        text_surf = self.font.render('Inventory', False, 'Black')
+        text_surf = text_renderer.render(self.font, 'Inventory', False, 'Black')
         text_rect = text_surf.get_rect(midbottom = (SCREEN_WIDTH / 2, 90))
 
         pygame.draw.rect(self.display_surface, 'White', text_rect.inflate(10, 10), 0, 6)
@@ -207,7 +260,7 @@ class Inventory:
         # add items to option list
         for item in self.options:
             item = item.replace('_', ' ')
-            text_surf = self.font.render(item, False, 'Black')
+            text_surf = text_renderer.render(self.font, item, False, 'Black')
             self.text_surfs.append(text_surf)
             self.height += text_surf.get_height() + self.padding * 2
 
@@ -218,16 +271,16 @@ class Inventory:
         self.main_rect = pygame.Rect(self.menu_left, self.menu_top, self.width, self.height)
 
     def input(self):
-        keys = pygame.key.get_pressed()
-        self.timer.update()
+        controls = self.controls
 
         # quit menu
-        if keys[pygame.K_ESCAPE] or keys[pygame.K_i]:
+        if controls.pressed('back') or controls.pressed('inventory'):
             self.toggle_inventory()
             
     def show_entry(self, text_surf, amount, price, item_type, top, selected):
         # background
         bg_rect = pygame.Rect(self.main_rect.left, top, self.width, text_surf.get_height() + self.padding * 2)
+        self.display_surface.blit(self.backdrop, bg_rect, bg_rect)
         pygame.draw.rect(self.display_surface, 'White', bg_rect, 0, 6)
 
         # text
@@ -235,14 +288,22 @@ class Inventory:
         self.display_surface.blit(text_surf, text_rect)
 
         # amount
-        amount_surf = self.font.render(str(amount), False, 'Black')
+        amount_surf = text_renderer.render(self.font, str(amount), False, 'Black')
         amount_rect = amount_surf.get_rect(midright = (self.main_rect.right - 20, bg_rect.centery))
         self.display_surface.blit(amount_surf, amount_rect)
 
-    def update(self):
-        self.input()
-        self.display_money()
-        self.display_title()
+        return bg_rect
+
+    def draw(self) -> list:
+        dirty_rects = []
+
+        # first frame: frozen world, title and every entry
+        if self.full_redraw:
+            self.display_surface.blit(self.backdrop, (0, 0))
+            self.display_title()
+            dirty_rects.append(self.display_surface.get_rect())
+            self.full_redraw = False
+        dirty_rects += self.display_money()
 
         for text_index, text_surf in enumerate(self.text_surfs):
             top = self.main_rect.top + text_index * (text_surf.get_height() + self.padding * 2 + self.space)
@@ -254,4 +315,11 @@ class Inventory:
             price = price_list[text_index]
 
             item_type = 'sell' if text_index < 4 else 'buy'
-            self.show_entry(text_surf, amount, price, item_type, top, self.index == text_index)
+
+            # only redraw entries whose amount or selection changed
+            state = (amount, self.index == text_index)
+            if self.entry_states.get(text_index) != state:
+                self.entry_states[text_index] = state
+                dirty_rects.append(self.show_entry(text_surf, amount, price, item_type, top, self.index == text_index))
+
+        return dirty_rects
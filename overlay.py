@@ -1,5 +1,8 @@
 import pygame
 from settings import *
+from assets import assets
+from profiler import profiler
+from text import text_renderer
 
 class Overlay:
     def __init__(self, player) -> None:
@@ -9,8 +12,8 @@ class Overlay:
 
         # imports
         overlay_path = '../graphics/overlay/'
-        self.tools_surf = {tool: pygame.image.load(f'{overlay_path}{tool}.png').convert_alpha() for tool in player.tools}
-        self.seeds_surf = {seed: pygame.image.load(f'{overlay_path}{seed}.png').convert_alpha() for seed in player.seeds}
+        self.tools_surf = {tool: assets.image(f'{overlay_path}{tool}.png') for tool in player.tools}
+        self.seeds_surf = {seed: assets.image(f'{overlay_path}{seed}.png') for seed in player.seeds}
 
     def display(self) -> None:
         # tool
@@ -22,3 +25,94 @@ class Overlay:
         seed_surf = self.seeds_surf[self.player.selected_seed]
         seed_rect = seed_surf.get_rect(midbottom = OVERLAY_POSITIONS['seed'])
         self.display_surface.blit(seed_surf, seed_rect)
+
+class PerfOverlay:
+    def __init__(self, level) -> None:
+        # general setup
+        self.display_surface = pygame.display.get_surface()
+        self.level = level
+        self.font = text_renderer.get_font('../font/LycheeSoda.ttf', 20)
+        self.line_height = self.font.get_linesize()
+
+        # panel, rebuilt every few frames so text rendering stays cheap
+        self.active = False
+        self.panel = None
+        self.frames_since_refresh = 0
+        self.width = 330
+        self.graph_height = 60
+        self.rect = pygame.Rect(10, 10, self.width, 0)
+
+        if PERF_OVERLAY:
+            self.toggle()
+
+    def toggle(self) -> None:
+        # the profiler only records while the overlay is visible
+        self.active = not self.active
+        profiler.enabled = self.active
+        profiler.frame = {}
+        profiler.samples = {}
+        self.panel = None
+
+    def get_counts(self) -> dict:
+        level = self.level
+        return {
+            'all': len(level.all_sprites),
+            'collision': len(level.collision_sprites),
+            'trees': len(level.tree_sprites),
+            'cows': len(level.cow_sprites),
+            'soil': len(level.soil_layer.soil_sprites),
+            'water': len(level.soil_layer.water_sprites),
+            'plants': len(level.soil_layer.plant_sprites),
+            'rain': int((level.rain.lifetime > 0).sum())
+        }
+
+    def build_panel(self, fps) -> None:
+        frame = profiler.stats('frame')
+        lines = [
+            f'{fps:.0f} fps',
+            f"frame  p50 {frame['p50']:.1f}  p95 {frame['p95']:.1f}  p99 {frame['p99']:.1f} ms"
+        ]
+        for name in profiler.samples:
+            if name != 'frame':
+                stats = profiler.stats(name)
+                lines.append(f"{name}  {stats['mean']:.2f}  p95 {stats['p95']:.2f} ms")
+        counts = [f'{name} {count}' for name, count in self.get_counts().items()]
+        lines.append('  '.join(counts[:4]))
+        lines.append('  '.join(counts[4:]))
+
+        # text on top, frame graph underneath
+        self.rect.height = len(lines) * self.line_height + self.graph_height + 15
+        self.panel = pygame.Surface(self.rect.size)
+        self.panel.fill('Black')
+        # stat lines are new every refresh, so they bypass the shared text cache
+        for index, line in enumerate(lines):
+            text_surf = self.font.render(line, False, 'White')
+            self.panel.blit(text_surf, (5, 5 + index * self.line_height))
+        self.graph_rect = pygame.Rect(5, self.rect.height - self.graph_height - 5, self.width - 10, self.graph_height)
+        self.frames_since_refresh = 0
+
+    def draw_graph(self) -> None:
+        # one column per frame, budget line at the target frame time
+        graph_rect = self.graph_rect.move(self.rect.topleft)
+        pygame.draw.rect(self.display_surface, '#202020', graph_rect)
+        scale = self.graph_height / (2 * PERF_BUDGET)
+        samples = list(profiler.samples.get('frame', []))[-graph_rect.width:]
+        for index, seconds in enumerate(samples):
+            height = min(self.graph_height, int(seconds * 1000 * scale))
+            color = 'Green' if seconds * 1000 <= PERF_BUDGET else 'Red'
+            x = graph_rect.left + index
+            pygame.draw.line(self.display_surface, color, (x, graph_rect.bottom - 1), (x, graph_rect.bottom - height))
+        budget_y = graph_rect.bottom - int(PERF_BUDGET * scale)
+        pygame.draw.line(self.display_surface, 'Yellow', (graph_rect.left, budget_y), (graph_rect.right - 1, budget_y))
+
+    def display(self, fps):
+        # returns the area drawn, None while hidden
+        if not self.active:
+            return None
+
+        self.frames_since_refresh += 1
+        if self.panel is None or self.frames_since_refresh >= PERF_REFRESH:
+            self.build_panel(fps)
+        self.display_surface.blit(self.panel, self.rect)
+        self.draw_graph()
+        return self.rect
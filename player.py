@@ -1,8 +1,8 @@
 import pygame
 from settings import *
-from support import *
+from assets import assets
 from timer import Timer
-from random import randint
+from rng import rng
 from json import load, dump
 
 class Player(pygame.sprite.Sprite):
@@ -15,7 +15,9 @@ class Player(pygame.sprite.Sprite):
         interaction_sprites,
         soil_layer,
         toggle_shop,
-        toggle_inventory) -> None:
+        toggle_inventory,
+        controls,
+        load_game) -> None:
         super().__init__(group)
 
         # import graphics from support
@@ -40,9 +42,7 @@ class Player(pygame.sprite.Sprite):
         # timers
         self.timers = {
             'tool use': Timer(800, self.use_tool),
-            'tool switch': Timer(200),
-            'seed use': Timer(350, self.use_seed),
-            'seed switch': Timer(200)
+            'seed use': Timer(350, self.use_seed)
         }
 
         # tool attributes
@@ -56,7 +56,7 @@ class Player(pygame.sprite.Sprite):
         self.selected_seed = self.seeds[self.seed_index]
 
         # inventory
-        if LOAD:
+        if load_game:
             with open('items.json', 'r') as openfile:
                 self.item_inventory = load(openfile)
             with open('seeds.json', 'r') as openfile:
@@ -64,7 +64,7 @@ class Player(pygame.sprite.Sprite):
             with open('money.json', 'r') as openfile:
                 self.money = load(openfile)
         else:
-            start_items = randint(0, 20) if START_ITEMS else 0
+            start_items = rng.get('player').randint(0, 20) if START_ITEMS else 0
             self.item_inventory = {
                 'wood': start_items,
                 'apple': start_items,
@@ -84,9 +84,10 @@ class Player(pygame.sprite.Sprite):
         self.soil_layer = soil_layer
         self.toggle_shop = toggle_shop
         self.toggle_inventory = toggle_inventory
+        self.controls = controls
 
         # import audio
-        self.water_sound = pygame.mixer.Sound('../audio/water.mp3')
+        self.water_sound = assets.sound('../audio/water.mp3')
         self.water_sound.set_volume(0.2 * MASTER_VOL)
 
     def use_tool(self) -> None:
@@ -135,7 +136,7 @@ class Player(pygame.sprite.Sprite):
 
         for animation in self.animations.keys():
             full_path = '../graphics/character/' + animation
-            self.animations[animation] = import_folder(full_path)
+            self.animations[animation] = assets.folder(full_path)
 
     def animate(self, dt) -> None:
         tool = self.status.endswith('e') or self.status.endswith('r') and not self.status.endswith('idle')
@@ -147,59 +148,57 @@ class Player(pygame.sprite.Sprite):
         self.image = self.animations[self.status][int(self.frame_index)]
 
     def input(self) -> None:
-        keys = pygame.key.get_pressed()
+        controls = self.controls
 
         if not self.timers['tool use'].active and not self.sleep:
             # vertical movement input
-            if keys[pygame.K_UP] or keys[pygame.K_w]:
+            if controls.held('up'):
                 self.direction.y = -1
                 self.status = 'up'
-            elif keys[pygame.K_DOWN] or keys[pygame.K_s]:
+            elif controls.held('down'):
                 self.direction.y = 1
                 self.status = 'down'
             else:
                 self.direction.y = 0
 
             # horizontal movement input
-            if keys[pygame.K_LEFT] or keys[pygame.K_a]:
+            if controls.held('left'):
                 self.direction.x = -1
                 self.status = 'left'
-            elif keys[pygame.K_RIGHT] or keys[pygame.K_d]:
+            elif controls.held('right'):
                 self.direction.x = 1
                 self.status = 'right'
             else:
                 self.direction.x = 0
 
-            # tool use input
-            if keys[pygame.K_SPACE]:
+            # tool use input, fires on a tap and repeats while held
+            if controls.held('use tool') or controls.pressed('use tool'):
                 self.timers['tool use'].activate()        
                 self.direction = pygame.math.Vector2(0, 0)
                 self.frame_index = 0
 
             # change tool
-            if keys[pygame.K_q] and not self.timers['tool switch'].active:
-                self.timers['tool switch'].activate()
+            if controls.pressed('switch tool'):
                 self.tool_index += 1
                 if self.tool_index >= len(self.tools):
                     self.tool_index = 0
                 self.selected_tool = self.tools[self.tool_index]
 
-            # seed use input
-            if keys[pygame.K_LALT] or keys[pygame.K_RALT]:
+            # seed use input, fires on a tap and repeats while held
+            if controls.held('use seed') or controls.pressed('use seed'):
                 self.timers['seed use'].activate()        
                 self.direction = pygame.math.Vector2(0, 0)
                 self.frame_index = 0
 
             # change seed
-            if keys[pygame.K_e] and not self.timers['seed switch'].active:
-                self.timers['seed switch'].activate()
+            if controls.pressed('switch seed'):
                 self.seed_index += 1
                 if self.seed_index >= len(self.seeds):
                     self.seed_index = 0
                 self.selected_seed = self.seeds[self.seed_index]
 
             # sleep / shop
-            if keys[pygame.K_RETURN]:
+            if controls.pressed('interact'):
                 collided_interaction_sprite = pygame.sprite.spritecollide(self, self.interaction_sprites, False)
                 if collided_interaction_sprite:
                     if collided_interaction_sprite[0].name == 'Trader':
@@ -208,7 +207,7 @@ class Player(pygame.sprite.Sprite):
                         self.status = 'left_idle'
                         self.sleep = True
 
-            if keys[pygame.K_i]:
+            if controls.pressed('inventory'):
                 if ANALYTICS and INVENTORY:
                     print('inventory')
                 self.toggle_inventory()
@@ -228,24 +227,23 @@ class Player(pygame.sprite.Sprite):
             timer.update()
 
     def collision(self, direction) -> None:
-        for sprite in self.collision_sprites.sprites():
-            if hasattr(sprite, 'hitbox'):
-                if sprite.hitbox.colliderect(self.hitbox):
-                    if direction == 'horizontal':
-                        if self.direction.x > 0: # moving right
-                            self.hitbox.right = sprite.hitbox.left
-                        if self.direction.x < 0: # moving left
-                            self.hitbox.left = sprite.hitbox.right
-                        self.rect.centerx = self.hitbox.centerx
-                        self.pos.x = self.hitbox.centerx
-
-                    if direction == 'vertical':
-                        if self.direction.y > 0: # moving down
-                            self.hitbox.bottom = sprite.hitbox.top
-                        if self.direction.y < 0: # moving up
-                            self.hitbox.top = sprite.hitbox.bottom
-                        self.rect.centery = self.hitbox.centery
-                        self.pos.y = self.hitbox.centery
+        for hitbox in self.collision_sprites.get_hitboxes(self.hitbox):
+            if hitbox.colliderect(self.hitbox):
+                if direction == 'horizontal':
+                    if self.direction.x > 0: # moving right
+                        self.hitbox.right = hitbox.left
+                    if self.direction.x < 0: # moving left
+                        self.hitbox.left = hitbox.right
+                    self.rect.centerx = self.hitbox.centerx
+                    self.pos.x = self.hitbox.centerx
+
+                if direction == 'vertical':
+                    if self.direction.y > 0: # moving down
+                        self.hitbox.bottom = hitbox.top
+                    if self.direction.y < 0: # moving up
+                        self.hitbox.top = hitbox.bottom
+                    self.rect.centery = self.hitbox.centery
+                    self.pos.y = self.hitbox.centery
 
     def move(self, dt) -> None:
         # normalize movement vector
@@ -0,0 +1,41 @@
+# registry of every sprite pool, for analytics
+pools = {}
+
+class SpritePool:
+    def __init__(self, name, sprite_type) -> None:
+        self.sprite_type = sprite_type
+        self.free = []
+
+        # analytics
+        self.created = 0
+        self.reused = 0
+        pools[name] = self
+
+    def get(self, **kwargs):
+        # reuse a killed sprite before allocating a new one
+        if self.free:
+            sprite = self.free.pop()
+            sprite.setup(**kwargs)
+            self.reused += 1
+        else:
+            sprite = self.sprite_type(**kwargs)
+            sprite.pool = self
+            self.created += 1
+        return sprite
+
+    def release(self, sprite) -> None:
+        self.free.append(sprite)
+
+    def stats(self) -> dict:
+        return {'size': len(self.free), 'created': self.created, 'reused': self.reused}
+
+class Poolable:
+    pool = None
+
+    def kill(self) -> None:
+        # return dead sprites to their pool
+        if self.alive() and self.pool:
+            super().kill()
+            self.pool.release(self)
+        else:
+            super().kill()
@@ -0,0 +1,66 @@
+from collections import deque
+from time import perf_counter
+from settings import PROFILER_WINDOW
+
+class Section:
+    def __init__(self, frame, name) -> None:
+        self.frame = frame
+        self.name = name
+
+    def __enter__(self) -> None:
+        self.start = perf_counter()
+
+    def __exit__(self, *args) -> None:
+        self.frame[self.name] = self.frame.get(self.name, 0) + perf_counter() - self.start
+
+class NullSection:
+    def __enter__(self) -> None:
+        pass
+
+    def __exit__(self, *args) -> None:
+        pass
+
+NULL_SECTION = NullSection()
+
+def percentile(values, percent) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(len(ordered) * percent / 100))
+    return ordered[index]
+
+class Profiler:
+    def __init__(self, window = PROFILER_WINDOW) -> None:
+        self.enabled = False
+        self.window = window
+        self.frame = {}
+        self.samples = {}
+
+    def section(self, name):
+        # shared no-op section while disabled
+        if not self.enabled:
+            return NULL_SECTION
+        return Section(self.frame, name)
+
+    def end_frame(self, frame_time) -> None:
+        if not self.enabled:
+            return
+
+        self.frame['frame'] = frame_time
+        for name, seconds in self.frame.items():
+            if name not in self.samples:
+                self.samples[name] = deque(maxlen = self.window)
+            self.samples[name].append(seconds)
+        self.frame = {}
+
+    def stats(self, name) -> dict:
+        # milliseconds over the rolling window
+        values = [seconds * 1000 for seconds in self.samples.get(name, [])]
+        if not values:
+            return {'mean': 0, 'p50': 0, 'p95': 0, 'p99': 0}
+        return {
+            'mean': sum(values) / len(values),
+            'p50': percentile(values, 50),
+            'p95': percentile(values, 95),
+            'p99': percentile(values, 99)
+        }
+
+profiler = Profiler()
@@ -0,0 +1,84 @@
+from json import dumps, loads
+from struct import Struct
+from zlib import compress, decompress
+from hashlib import sha1
+from rng import rng
+
+SAVE_FILES = ['save.json', 'items.json', 'seeds.json', 'money.json']
+
+# per simulation step: dt and the held, pressed and released action masks
+FRAME = Struct('<dIII')
+HEADER = Struct('<I')
+VERSION = 2
+
+def read_saves() -> dict:
+    saves = {}
+    for path in SAVE_FILES:
+        with open(path, 'r') as openfile:
+            saves[path] = openfile.read()
+    return saves
+
+def write_saves(saves) -> None:
+    for path, contents in saves.items():
+        with open(path, 'w') as outfile:
+            outfile.write(contents)
+
+def get_state_digest(level) -> str:
+    # compact fingerprint of the simulation, equal digests mean identical replays
+    player = level.player
+    state = [
+        round(player.pos.x, 3), round(player.pos.y, 3),
+        player.money, sorted(player.item_inventory.items()), sorted(player.seed_inventory.items()),
+        level.raining, level.soil_layer.grid.flags.tobytes(),
+        sorted((type(sprite).__name__, sprite.rect.topleft) for sprite in level.all_sprites)
+    ]
+    return sha1(repr(state).encode()).hexdigest()
+
+class Recorder:
+    def __init__(self, path, controls, seed = None) -> None:
+        self.path = path
+        self.controls = controls
+
+        # the seed and starting saves are all a replay needs besides input
+        rng.seed(seed)
+        self.seed = rng.session_seed
+        self.saves = read_saves()
+        self.frames = []
+
+    def begin_frame(self, dt) -> None:
+        self.frames.append((dt, *self.controls.get_state()))
+
+    def save(self) -> None:
+        header = dumps({'version': VERSION, 'seed': self.seed, 'saves': self.saves}).encode()
+        data = HEADER.pack(len(header)) + header + b''.join(FRAME.pack(*frame) for frame in self.frames)
+        with open(self.path, 'wb') as outfile:
+            outfile.write(compress(data))
+
+class Replayer:
+    def __init__(self, path, controls) -> None:
+        self.controls = controls
+        with open(path, 'rb') as openfile:
+            data = decompress(openfile.read())
+        header_size = HEADER.unpack_from(data)[0]
+        header = loads(data[HEADER.size:HEADER.size + header_size])
+        if header.get('version') != VERSION:
+            raise ValueError(f'{path} was recorded with an older input format')
+        self.frames = list(FRAME.iter_unpack(data[HEADER.size + header_size:]))
+        self.saves = header['saves']
+        self.seed = header['seed']
+        rng.seed(self.seed)
+
+        self.index = 0
+
+    def restore_saves(self) -> None:
+        # the level has to start from the recorded save state
+        write_saves(self.saves)
+
+    def begin_frame(self):
+        # recorded dt for the next step, None once the recording ends
+        if self.index >= len(self.frames):
+            return None
+        dt, held, pressed, released = self.frames[self.index]
+        self.index += 1
+        self.controls.set_state(held, pressed, released)
+        return dt
@@ -0,0 +1,28 @@
+import random
+import numpy as np
+from zlib import crc32
+
+class RandomStreams:
+    def __init__(self) -> None:
+        self.seed()
+
+    def seed(self, session_seed = None) -> None:
+        # every stream derives from one session seed
+        if session_seed is None:
+            session_seed = random.SystemRandom().randrange(2 ** 32)
+        self.session_seed = session_seed
+        self.streams = {}
+
+    def get(self, name) -> random.Random:
+        # independent stream per consumer, so adding one never shifts another
+        if name not in self.streams:
+            self.streams[name] = random.Random(f'{self.session_seed}:{name}')
+        return self.streams[name]
+
+    def get_numpy(self, name) -> np.random.Generator:
+        key = 'numpy ' + name
+        if key not in self.streams:
+            self.streams[key] = np.random.default_rng([self.session_seed, crc32(name.encode())])
+        return self.streams[key]
+
+rng = RandomStreams()
@@ -8,6 +8,26 @@ ACTION = False
 INVENTORY = True
 SHOP = True
 COW = False
+LOADING = False
+
+# frames kept for rolling timing statistics
+PROFILER_WINDOW = 240
+
+# frame timing: fixed simulation step, render cap (0 for unlimited) and
+# the lower cap used while the window is unfocused or a menu is open
+FIXED_DT = 1 / 60
+MAX_STEPS = 5
+FPS_CAP = 60
+IDLE_FPS = 30
+
+# held menu navigation: ms before the first repeat, then ms between repeats
+KEY_REPEAT_DELAY = 300
+KEY_REPEAT_INTERVAL = 200
+
+# performance overlay (toggled with F3)
+PERF_OVERLAY = False
+PERF_REFRESH = 15
+PERF_BUDGET = 1000 / 60
 
 # gameplay modes
 RAIN_MODE = False
@@ -18,17 +38,31 @@ START_ITEMS = False
 # volume
 MASTER_VOL = 0.1
 
-# new / load
-if os.path.getsize('save.json') != 0 and os.path.getsize('items.json') != 0 and os.path.getsize('seeds.json') != 0 and os.path.getsize('money.json') != 0:
-	LOAD = True
-else:
-	LOAD = False
+# new / load: checked when a level is built, after a replay has put its saves in place
+def has_save() -> bool:
+	return all(os.path.getsize(path) != 0 for path in ('save.json', 'items.json', 'seeds.json', 'money.json'))
 
 # screen attributes
 SCREEN_WIDTH = 1280 * .999
 SCREEN_HEIGHT = 720 * .97
 TILE_SIZE = 64
 
+# rendered text surfaces kept by the text cache
+TEXT_CACHE_SIZE = 128
+
+# spatial index and baked chunk size
+CHUNK_SIZE = 512
+
+# collision broadphase cell size
+COLLISION_CELL_SIZE = 128
+
+# packed animation atlases (built by atlas.py)
+ATLAS_PATH = '../cache/atlas/'
+ATLAS_WIDTH = 2048
+
+# compiled map.tmx (rebuilt when the map or its tilesets change)
+MAP_CACHE_PATH = '../cache/map.pickle'
+
 # overlay positions 
 OVERLAY_POSITIONS = {
 	'tool' : (40, SCREEN_HEIGHT - 15), 
@@ -60,6 +94,17 @@ LAYERS = {
 	'rain drops': 10
 }
 
+# layers whose sprites move or change size and need y-sorting every frame
+DYNAMIC_LAYERS = ['ground plant', 'main', 'fruit', 'rain floor', 'rain drops']
+
+# overcast weather tint multiplied over the scene while raining
+RAIN_TINT = (200, 210, 230)
+
+# rain particles
+RAIN_CAPACITY = 256
+RAIN_RATE = 60
+RAIN_MARGIN = 300
+
 # apple positions
 APPLE_POS = {
 	'Small': [(18,17), (30,37), (12,50), (30,45), (20,30), (30,10)],
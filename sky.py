@@ -1,76 +1,98 @@
 import pygame
 from settings import *
-from support import import_folder
-from sprites import Generic
-from random import randint, choice
+from assets import assets
+import numpy as np
+from rng import rng
+from tilemap import load_map
 
 class Sky:
-    def __init__(self):
-        self.display_surface = pygame.display.get_surface()
-        self.full_surf = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+    def __init__(self, compositor):
+        self.compositor = compositor
         self.start_color = [255, 255, 255]
         self.end_color = (38, 101, 189)
 
-    def display(self, dt):
+    def update(self, dt):
         for index, value in enumerate(self.end_color):
             if self.start_color[index] > value:
                 self.start_color[index] -= 0.5 * dt
 
-        self.full_surf.fill(self.start_color)
-        self.display_surface.blit(
-            source = self.full_surf, 
-            dest = (0, 0), 
-            special_flags = pygame.BLEND_RGBA_MULT)
+        # daylight tint, blended by the compositor
+        self.compositor.set_tint('sky', self.start_color)
+
+class Rain:
+    def __init__(self, all_sprites):
+        self.all_sprites = all_sprites
+        self.display_surface = pygame.display.get_surface()
+        self.rain_drops = assets.folder('../graphics/rain/drops/')
+        self.rain_floor = assets.folder('../graphics/rain/floor/')
+        self.rng = rng.get_numpy('rain')
+
+        # fixed-capacity particle arrays
+        self.pos = np.zeros((RAIN_CAPACITY, 2), dtype = np.float32)
+        self.velocity = np.zeros((RAIN_CAPACITY, 2), dtype = np.float32)
+        self.lifetime = np.zeros(RAIN_CAPACITY, dtype = np.float32)
+        self.surf_index = np.zeros(RAIN_CAPACITY, dtype = np.int32)
+        self.moving = np.zeros(RAIN_CAPACITY, dtype = bool)
+        self.spawn_budget = 0
+
+        # drops only land on the map
+        map_data = load_map()
+        self.ground_rect = pygame.Rect(0, 0, map_data.width * TILE_SIZE, map_data.height * TILE_SIZE)
 
-class Drop(Generic):
-    def __init__(self, pos, surf, moving, groups, z):
-        # general setup
-        super().__init__(pos, surf, groups, z)
-        self.lifetime = randint(400, 500)
-        self.start_time = pygame.time.get_ticks()
+        # drawn in batches at their layers by the camera
+        self.all_sprites.add_renderer(LAYERS['rain floor'], self.draw_floor)
+        self.all_sprites.add_renderer(LAYERS['rain drops'], self.draw_drops)
+
+    def spawn(self, amount, moving, area):
+        free = np.flatnonzero(self.lifetime <= 0)[:amount]
+        amount = len(free)
+        if amount == 0:
+            return
+
+        self.pos[free, 0] = self.rng.uniform(area.left, area.right, amount)
+        self.pos[free, 1] = self.rng.uniform(area.top, area.bottom, amount)
+        self.lifetime[free] = self.rng.uniform(0.4, 0.5, amount)
+        self.moving[free] = moving
 
         # rain movement
-        self.moving = moving
-        if self.moving:
-            self.pos = pygame.math.Vector2(self.rect.topleft)
-            self.direction = pygame.math.Vector2(-2, 4)
-            self.speed = randint(200, 250)
+        if moving:
+            speed = self.rng.uniform(200, 250, amount)
+            self.velocity[free, 0] = -2 * speed
+            self.velocity[free, 1] = 4 * speed
+            self.surf_index[free] = self.rng.integers(0, len(self.rain_drops), amount)
+        else:
+            self.velocity[free] = 0
+            self.surf_index[free] = self.rng.integers(0, len(self.rain_floor), amount)
 
-    def update(self, dt):
-        # movement
-        if self.moving:
-            self.pos += self.direction * self.speed * dt
-            self.rect.topleft = (round(self.pos.x), round(self.pos.y))
+    def update(self, dt, raining, target):
+        # spawn at a fixed rate around where the camera will look, clipped to the map
+        if raining:
+            area = pygame.Rect(self.all_sprites.get_offset(target), (SCREEN_WIDTH, SCREEN_HEIGHT)).inflate(RAIN_MARGIN * 2, RAIN_MARGIN * 2)
+            area = area.clip(self.ground_rect)
+            self.spawn_budget += RAIN_RATE * dt
+            amount = int(self.spawn_budget)
+            self.spawn_budget -= amount
+            if area.width and area.height:
+                self.spawn(amount, False, area)
+                self.spawn(amount, True, area)
 
-        # timer
-        if pygame.time.get_ticks() - self.start_time >= self.lifetime:
-            self.kill()
+        # advance every drop in one step
+        self.pos += self.velocity * dt
+        self.lifetime -= dt
 
-class Rain:
-    def __init__(self, all_sprites):
-        self.all_sprites = all_sprites
-        self.rain_drops = import_folder('../graphics/rain/drops/')
-        self.rain_floor = import_folder('../graphics/rain/floor/')
-        self.floor_w, self.floor_h = pygame.image.load('../graphics/world/ground.png').get_size()
-
-    def create_floor(self):
-        Drop(
-            pos = (randint(0, self.floor_w), randint(0, self.floor_h)),
-            surf = choice(self.rain_floor),
-            moving = False,
-            groups = self.all_sprites,
-            z = LAYERS['rain floor']
-        )
-
-    def create_drops(self):
-        Drop(
-            pos = (randint(0, self.floor_w), randint(0, self.floor_h)),
-            surf = choice(self.rain_drops),
-            moving = True,
-            groups = self.all_sprites,
-            z = LAYERS['rain drops']
-        )
-
-    def update(self):
-        self.create_floor()
-        self.create_drops()
+    def draw(self, offset, moving, surfs):
+        visible = np.flatnonzero((self.lifetime > 0) & (self.moving == moving))
+        if len(visible) == 0:
+            return
+
+        screen_pos = (self.pos[visible] - (offset.x, offset.y)).astype(np.int32).tolist()
+        surf_index = self.surf_index[visible].tolist()
+        self.display_surface.blits(
+            [(surfs[index], pos) for index, pos in zip(surf_index, screen_pos)],
+            doreturn = False)
+
+    def draw_floor(self, offset):
+        self.draw(offset, False, self.rain_floor)
+
+    def draw_drops(self, offset):
+        self.draw(offset, True, self.rain_drops)
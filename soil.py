@@ -1,335 +1,361 @@
 import pygame
 from settings import *
-from pytmx.util_pygame import load_pygame
-from support import *
-from random import choice
+from tilemap import load_map
+from assets import assets
+from rng import rng
 from json import dump, load
-
-class SoilTile(pygame.sprite.Sprite):
+from pool import SpritePool, Poolable
+from soilgrid import SoilGrid, FARMABLE, TILLED, WATERED, PLANTED
+import numpy as np
+
+# neighbor offsets in soil mask bit order: t, b, l, r, tl, tr, bl, br
+NEIGHBORS = [(0, -1), (0, 1), (-1, 0), (1, 0), (-1, -1), (1, -1), (-1, 1), (1, 1)]
+
+def get_tile_type(mask) -> str:
+    # soil tile options
+    t, b, l, r, tl, tr, bl, br = [bool(mask & 1 << bit) for bit in range(8)]
+
+    tm = all((l, r, b)) and not t and (bl or br)
+    bm = all((l, r, t)) and not b and (tl or tr)
+    lm = all((t, r, b)) and not l and (tr or br)
+    rm = all((t, l, b)) and not r and (tl or bl)
+
+    # default
+    tile_type = 'o'
+
+    # all sides
+    if all((t, b, r, l)):
+        tile_type = 'x'
+    
+    # horizontal only
+    if l and not any((t, b, r)):
+        tile_type = 'r'
+    if r and not any((t, b, l)):
+        tile_type = 'l'
+    if l and r and not any((t, b)):
+        tile_type = 'lr'
+
+    # vertical only
+    if t and not any((b, l, r)):
+        tile_type = 'b'
+    if b and not any((t, l, r)):
+        tile_type = 't'
+    if t and b and not any((l, r)):
+        tile_type = 'tb'
+
+    # corners
+    if t and l and not any((b, r)):
+        tile_type = 'br'
+    if t and r and not any((b, l)):
+        tile_type = 'bl'
+    if b and l and not any((t, r)):
+        tile_type = 'tr'
+    if b and r and not any((t, l)):
+        tile_type = 'tl'
+
+    # three-sided path
+    if all((t, b, r)) and not l:
+        tile_type = 'tbr'
+    if all((t, b, l)) and not r:
+        tile_type = 'tbl'
+    if all((t, l, r)) and not b:
+        tile_type = 'tlr'
+    if all((b, l, r)) and not t:
+        tile_type = 'blr'
+
+    # three-sided middle
+    if tm:
+        tile_type = 'tm'
+    if bm:
+        tile_type = 'bm'
+    if lm:
+        tile_type = 'lm'
+    if rm:
+        tile_type = 'rm'
+
+    return tile_type
+
+# soil image for every neighbor mask
+TILE_TYPES = [get_tile_type(mask) for mask in range(256)]
+
+class SoilTile(Poolable, pygame.sprite.Sprite):
     def __init__(self, pos, surf, groups) -> None:
+        self.setup(pos, surf, groups)
+
+    def setup(self, pos, surf, groups) -> None:
         super().__init__(groups)
         self.image = surf
         self.rect = self.image.get_rect(topleft = pos)
         self.z = LAYERS['soil']
 
-class WaterTile(pygame.sprite.Sprite):
+class WaterTile(Poolable, pygame.sprite.Sprite):
     def __init__(self, pos, surf, groups) -> None:
+        self.setup(pos, surf, groups)
+
+    def setup(self, pos, surf, groups) -> None:
         super().__init__(groups)
         self.image = surf
         self.rect = self.image.get_rect(topleft = pos)
         self.z = LAYERS['soil water']
 
+soil_tile_pool = SpritePool('soil tile', SoilTile)
+water_tile_pool = SpritePool('water tile', WaterTile)
+
 class Plant(pygame.sprite.Sprite):
-    def __init__(self, type, groups, soil, check_watered) -> None:
+    def __init__(self, type, groups, soil) -> None:
         super().__init__(groups)
 
         # setup
         self.type = type
-        self.frames = import_folder(f'../graphics/fruit/{type}')
+        self.frames = assets.folder(f'../graphics/fruit/{type}')
         self.soil = soil
-        self.check_watered = check_watered
+        self.tile = (soil.rect.x // TILE_SIZE, soil.rect.y // TILE_SIZE)
 
-        # growth attributes
-        self.age = 0
+        # growth attributes, the age itself lives in the soil layer arrays
+        self.stage = 0
         self.max_age = len(self.frames) - 1
-        self.grow_speed = GROW_SPEED[type]
         self.harvestable = False
 
         # sprite setup
-        self.image = self.frames[self.age]
+        self.image = self.frames[self.stage]
         self.y_offset = -16 if type == 'corn' else -8
         self.rect = self.image.get_rect(midbottom = soil.rect.midbottom + pygame.math.Vector2(0, self.y_offset))
         self.z = LAYERS['ground plant']
 
-    def grow(self):
-        if self.check_watered(self.rect.center):
-            # increase age
-            if self.age < self.max_age:
-                self.age += self.grow_speed
-            else:
-                self.harvestable = True
-                if not RIGID_PLANTS:
-                    self.hitbox = self.rect.copy().inflate(-26, -self.rect.height * 0.4)
-
-            # update z-index for above-ground plant
-            if int(self.age) > 0:
-                self.z = LAYERS['main']
-                if RIGID_PLANTS:
-                    self.hitbox = self.rect.copy().inflate(-26, -self.rect.height * 0.4)
-
-            # update sprite
-            self.image = self.frames[int(self.age)]
-            self.rect = self.image.get_rect(midbottom = self.soil.rect.midbottom + pygame.math.Vector2(0, self.y_offset))
+    def set_stage(self, stage):
+        self.stage = stage
+
+        # update z-index for above-ground plant
+        if self.stage > 0:
+            self.z = LAYERS['main']
+            if RIGID_PLANTS:
+                self.hitbox = self.rect.copy().inflate(-26, -self.rect.height * 0.4)
+
+        # update sprite
+        self.image = self.frames[self.stage]
+        self.rect = self.image.get_rect(midbottom = self.soil.rect.midbottom + pygame.math.Vector2(0, self.y_offset))
+
+    def ripen(self):
+        self.harvestable = True
+        if not RIGID_PLANTS:
+            self.hitbox = self.rect.copy().inflate(-26, -self.rect.height * 0.4)
 
 class SoilLayer:
-    def __init__(self, all_sprites, collision_sprites) -> None:
+    def __init__(self, all_sprites, collision_sprites, load_game) -> None:
         # sprite groups
         self.all_sprites = all_sprites
         self.collision_sprites = collision_sprites
         self.soil_sprites = pygame.sprite.Group()
         self.water_sprites = pygame.sprite.Group()
         self.plant_sprites = pygame.sprite.Group()
+        self.random = rng.get('soil')
+
+        # sprites by tile, so tool actions never scan a group
+        self.soil_tiles = {}
+        self.water_tiles = {}
+        self.plants = {}
+
+        # ripe plants by tile, so harvesting only looks under the player
+        self.harvestable = {}
 
         # graphics
-        self.soil_surf = pygame.image.load('../graphics/soil/o.png')
-        self.soil_surfs = import_folder_dict('../graphics/soil/')
-        self.water_surfs = import_folder('../graphics/soil_water/')
+        self.soil_surfs = assets.folder_dict('../graphics/soil/')
+        self.water_surfs = assets.folder('../graphics/soil_water/')
 
         # create grid
-        self.create_soil_grid()
-        self.create_hit_rects()
+        self.create_soil_grid(load_game)
 
         # import audio
-        self.hoe_sound = pygame.mixer.Sound('../audio/hoe.wav')
+        self.hoe_sound = assets.sound('../audio/hoe.wav')
         self.hoe_sound.set_volume(0.1 * MASTER_VOL)
-        self.plant_sound = pygame.mixer.Sound('../audio/plant.wav')
+        self.plant_sound = assets.sound('../audio/plant.wav')
         self.plant_sound.set_volume(0.2 * MASTER_VOL)
 
-    def create_soil_grid(self):
-        ground = pygame.image.load('../graphics/world/ground.png')
+    def create_soil_grid(self, load_game):
+        ground = assets.image('../graphics/world/ground.png')
         h_tiles = ground.get_width() // TILE_SIZE
         v_tiles = ground.get_height() // TILE_SIZE
 
-        # load grid from JSON
-        if LOAD:
+        # crop growth per tile, advanced in bulk overnight
+        self.ages = np.zeros((v_tiles, h_tiles), dtype = np.float32)
+        self.grow_speeds = np.zeros((v_tiles, h_tiles), dtype = np.float32)
+        self.max_ages = np.zeros((v_tiles, h_tiles), dtype = np.float32)
+        self.ripe = np.zeros((v_tiles, h_tiles), dtype = bool)
+
+        # load grid from JSON (compact flags, or the old list of letters)
+        if load_game:
             with open('save.json', 'r') as openfile:
-                self.grid = load(openfile)
-            self.create_soil_tiles()
+                self.grid = SoilGrid.from_save(load(openfile))
+            self.load_farm()
         else:
-            self.grid = [[[] for col in range(h_tiles)] for row in range(v_tiles)]
-            farmable_tiles = load_pygame('../data/map.tmx').get_layer_by_name('Farmable').tiles()
+            self.grid = SoilGrid(h_tiles, v_tiles)
+            farmable_tiles = load_map().get_layer_by_name('Farmable').tiles()
             for x, y, surface in farmable_tiles:
-                self.grid[y][x].append('F')
-
-    def create_hit_rects(self):
-        self.hit_rects = []
-        for row_index, row in enumerate(self.grid):
-            for col_index, cell in enumerate(row):
-                if 'F' in cell:
-                    x = col_index * TILE_SIZE
-                    y = row_index * TILE_SIZE
-                    rect = pygame.Rect(x, y, TILE_SIZE, TILE_SIZE)
-                    self.hit_rects.append(rect)
+                self.grid.set((x, y), FARMABLE)
+
+    def load_farm(self):
+        # soil first, then water and plants on top
+        self.update_soil_tiles(self.grid.get_tiles(TILLED))
+        for tile in self.grid.watered:
+            if tile in self.soil_tiles:
+                self.add_water(tile)
+        for tile in self.grid.planted:
+            if tile in self.soil_tiles:
+                self.add_plant(tile, self.grid.get_crop(tile))
+
+    def get_tile(self, pos) -> tuple:
+        return (int(pos[0] // TILE_SIZE), int(pos[1] // TILE_SIZE))
+
+    def save(self):
+        with open("save.json", "w") as outfile:
+            dump(self.grid.to_save(), outfile)
 
     def get_hit(self, point):
-        for rect in self.hit_rects:
-            if rect.collidepoint(point):
-                # play audio
-                self.hoe_sound.play()
-
-                # tile update
-                x = rect.x // TILE_SIZE
-                y = rect.y // TILE_SIZE
-                if 'F' in self.grid[y][x]:
-                    self.grid[y][x].append('X')
-                    self.create_soil_tiles()
-                    if self.raining:
-                        self.water_all()
-
-                # write to JSON
-                with open("save.json", "w") as outfile:
-                    dump(self.grid, outfile)
+        tile = self.get_tile(point)
+        if self.grid.has(tile, FARMABLE):
+            # play audio
+            self.hoe_sound.play()
+
+            # tile update
+            if not self.grid.has(tile, TILLED):
+                self.grid.set(tile, TILLED)
+                self.update_soil_tiles([(tile[0] + dx, tile[1] + dy) for dy in (-1, 0, 1) for dx in (-1, 0, 1)])
+                if self.raining:
+                    self.grid.set(tile, WATERED)
+                    self.add_water(tile)
+
+    def add_water(self, tile):
+        x, y = tile
+        self.water_tiles[tile] = water_tile_pool.get(
+            pos = (x * TILE_SIZE, y * TILE_SIZE),
+            surf = self.random.choice(self.water_surfs),
+            groups = [self.all_sprites, self.water_sprites]
+        )
 
     def water(self, target_pos):
-        for soil_sprite in self.soil_sprites.sprites():
-            if soil_sprite.rect.collidepoint(target_pos):
-                # update soil grid data
-                x = soil_sprite.rect.x // TILE_SIZE
-                y = soil_sprite.rect.y // TILE_SIZE
-                self.grid[y][x].append('W')
-
-                # update soil tile
-                pos = soil_sprite.rect.topleft
-                surf = choice(self.water_surfs)
-                WaterTile(
-                    pos = pos,
-                    surf = surf,
-                    groups = [self.all_sprites, self.water_sprites]
-                )
-
-                # write to JSON
-                with open("save.json", "w") as outfile:
-                    dump(self.grid, outfile)
+        tile = self.get_tile(target_pos)
+        if tile in self.soil_tiles and tile not in self.water_tiles:
+            # update soil grid data
+            self.grid.set(tile, WATERED)
+            self.add_water(tile)
 
     def water_all(self):
-        # loop through all soil and water (called during rain)
-        for row_index, row in enumerate(self.grid):
-            for col_index, cell in enumerate(row):
-                if 'X' in cell:
-                    # update soil tile
-                    if 'W' not in cell:
-                        cell.append('W')
-                    x = col_index * TILE_SIZE
-                    y = row_index * TILE_SIZE
-                    surf = choice(self.water_surfs)
-                    WaterTile(
-                        pos = (x, y),
-                        surf = surf,
-                        groups = [self.all_sprites, self.water_sprites]
-                    )
-
-                    # write to JSON
-                    with open("save.json", "w") as outfile:
-                        dump(self.grid, outfile)
+        # water every dry soil tile in one pass (called during rain)
+        for tile in self.grid.set_where(self.grid.get_mask(TILLED), WATERED):
+            self.add_water(tile)
 
     def remove_water(self):
-        # kill water sprites
-        for sprite in self.water_sprites.sprites():
+        # kill water sprites and clean up soil grid
+        for sprite in self.water_tiles.values():
             sprite.kill()
+        self.water_tiles.clear()
+        self.grid.clear_all(WATERED)
+
+    def add_plant(self, tile, seed):
+        plant = Plant(
+            type = seed,
+            groups = [self.all_sprites, self.plant_sprites, self.collision_sprites],
+            soil = self.soil_tiles[tile]
+        )
+        self.plants[tile] = plant
+
+        # growth state
+        x, y = tile
+        self.ages[y, x] = 0
+        self.grow_speeds[y, x] = GROW_SPEED[seed]
+        self.max_ages[y, x] = plant.max_age
+        self.ripe[y, x] = False
 
-        # clean up soil grid
-        for row in self.grid:
-            for cell in row:
-                if 'W' in cell:
-                    cell.remove('W')
+    def plant_seed(self, target_pos, seed) -> bool:
+        tile = self.get_tile(target_pos)
+        if tile not in self.soil_tiles or tile in self.plants:
+            return False
 
-        # write to JSON
-        with open("save.json", "w") as outfile:
-            dump(self.grid, outfile)
+        # play audio
+        # self.plant_sound.play()
 
-    def check_watered(self, pos) -> bool:
-        x = pos[0] // TILE_SIZE
-        y = pos[1] // TILE_SIZE
-        cell = self.grid[y][x]
-        is_watered = 'W' in cell
-        return is_watered
+        # tile update
+        self.grid.set_crop(tile, seed)
+        self.add_plant(tile, seed)
 
-    def plant_seed(self, target_pos, seed) -> bool:
-        for soil_sprite in self.soil_sprites.sprites():
-            if soil_sprite.rect.collidepoint(target_pos):
-                # play audio
-                # self.plant_sound.play()
-
-                # tile update
-                x = soil_sprite.rect.x // TILE_SIZE
-                y = soil_sprite.rect.y // TILE_SIZE
-                if 'C' not in self.grid[y][x] and 'T' not in self.grid[y][x]:
-                    if seed == 'corn':
-                        letter = 'C'
-                    elif seed == 'tomato':
-                        letter = 'T'
-                    self.grid[y][x].append(letter)
-                    Plant(
-                        type = seed,
-                        groups = [self.all_sprites, self.plant_sprites, self.collision_sprites],
-                        soil = soil_sprite,
-                        check_watered = self.check_watered
-                    )
-                else:
-                    return False
-
-                # write to JSON
-                with open("save.json", "w") as outfile:
-                    dump(self.grid, outfile)
-                
-                return True
-            
-    def load_seed(self, target_pos, seed):
-        if ANALYTICS:
-            print('planting seed')
-            if load:
-                print('from save')
-
-        for soil_sprite in self.soil_sprites.sprites():
-            if soil_sprite.rect.collidepoint(target_pos):
-                # tile update
-                x = soil_sprite.rect.x // TILE_SIZE
-                y = soil_sprite.rect.y // TILE_SIZE
-                Plant(
-                    type = seed,
-                    groups = [self.all_sprites, self.plant_sprites, self.collision_sprites],
-                    soil = soil_sprite,
-                    check_watered = self.check_watered
-                )               
+        # write to JSON before the seed is spent, like the other save files
+        self.save()
+        return True
 
     def update_plants(self):
-        for plant in self.plant_sprites.sprites():
-            plant.grow()        
-
-    def create_soil_tiles(self):
-        self.soil_sprites.empty()
-        for row_index, row in enumerate(self.grid):
-            for col_index, cell in enumerate(row):
-                if 'X' in cell:
-                    # soil tile options
-                    t = 'X' in self.grid[row_index - 1][col_index]
-                    b = 'X' in self.grid[row_index + 1][col_index]
-                    r = 'X' in row[col_index + 1]
-                    l = 'X' in row[col_index - 1]
-
-                    tm = all((l, r, b)) and not t and ('X' in self.grid[row_index + 1][col_index - 1] or 'X' in self.grid[row_index + 1][col_index + 1])
-                    bm = all((l, r, t)) and not b and ('X' in self.grid[row_index - 1][col_index - 1] or 'X' in self.grid[row_index - 1][col_index + 1])
-                    lm = all((t, r, b)) and not l and ('X' in self.grid[row_index - 1][col_index + 1] or 'X' in self.grid[row_index + 1][col_index + 1])
-                    rm = all((t, l, b)) and not r and ('X' in self.grid[row_index - 1][col_index - 1] or 'X' in self.grid[row_index + 1][col_index - 1])
-
-                    # default
-                    tile_type = 'o'
-
-                    # all sides
-                    if all((t, b, r, l)):
-                        tile_type = 'x'
-                    
-                    # horizontal only
-                    if l and not any((t, b, r)):
-                        tile_type = 'r'
-                    if r and not any((t, b, l)):
-                        tile_type = 'l'
-                    if l and r and not any((t, b)):
-                        tile_type = 'lr'
-
-                    # vertical only
-                    if t and not any((b, l, r)):
-                        tile_type = 'b'
-                    if b and not any((t, l, r)):
-                        tile_type = 't'
-                    if t and b and not any((l, r)):
-                        tile_type = 'tb'
-
-                    # corners
-                    if t and l and not any((b, r)):
-                        tile_type = 'br'
-                    if t and r and not any((b, l)):
-                        tile_type = 'bl'
-                    if b and l and not any((t, r)):
-                        tile_type = 'tr'
-                    if b and r and not any((t, l)):
-                        tile_type = 'tl'
-
-                    # three-sided path
-                    if all((t, b, r)) and not l:
-                        tile_type = 'tbr'
-                    if all((t, b, l)) and not r:
-                        tile_type = 'tbl'
-                    if all((t, l, r)) and not b:
-                        tile_type = 'tlr'
-                    if all((b, l, r)) and not t:
-                        tile_type = 'blr'
-
-                    # three-sided middle
-                    if tm:
-                        tile_type = 'tm'
-                    if bm:
-                        tile_type = 'bm'
-                    if lm:
-                        tile_type = 'lm'
-                    if rm:
-                        tile_type = 'rm'
-                    
-
-                    SoilTile(
-                        pos = (col_index * TILE_SIZE, row_index * TILE_SIZE),
-                        surf = self.soil_surfs[tile_type],
-                        groups = [self.all_sprites, self.soil_sprites]
-                    )
-
-                if 'C' in cell:
-                    self.load_seed(
-                        target_pos = (col_index * TILE_SIZE, row_index * TILE_SIZE),
-                        seed = 'corn'
-                    )
+        # plants watered yesterday grow, fully grown ones ripen a day later
+        growing = self.grid.get_mask(PLANTED) & self.grid.get_mask(WATERED)
+        ripening = growing & (self.ages >= self.max_ages) & ~self.ripe
+        aging = growing & (self.ages < self.max_ages)
+        stages = self.ages.astype(np.int32)
+        self.ages[aging] += self.grow_speeds[aging]
+        self.ripe |= ripening
+
+        # sprites only for tiles whose visible stage changed
+        rows, cols = np.nonzero(aging & (self.ages.astype(np.int32) != stages))
+        for x, y in zip(cols.tolist(), rows.tolist()):
+            plant = self.plants[(x, y)]
+            plant.set_stage(int(self.ages[y, x]))
+            self.all_sprites.refresh(plant)
+            self.collision_sprites.refresh(plant)
+
+        rows, cols = np.nonzero(ripening)
+        for x, y in zip(cols.tolist(), rows.tolist()):
+            plant = self.plants[(x, y)]
+            plant.ripen()
+            self.collision_sprites.refresh(plant)
+            self.harvestable[(x, y)] = plant
+
+    def advance_day(self, raining):
+        # growth uses yesterday's water, then the soil dries or the rain waters it
+        self.update_plants()
+        if raining:
+            self.water_all()
+        else:
+            self.remove_water()
 
-                if 'T' in cell:
-                    self.load_seed(
-                        target_pos = (col_index * TILE_SIZE, row_index * TILE_SIZE),
-                        seed = 'tomato'
+        # write to JSON
+        self.save()
+
+    def get_harvestable(self, rect) -> list:
+        # plants stand taller than their tile, so look one tile around rect
+        plants = []
+        for y in range(rect.top // TILE_SIZE - 1, (rect.bottom - 1) // TILE_SIZE + 2):
+            for x in range(rect.left // TILE_SIZE - 1, (rect.right - 1) // TILE_SIZE + 2):
+                if (x, y) in self.harvestable:
+                    plants.append(self.harvestable[(x, y)])
+        return plants
+
+    def harvest(self, plant):
+        del self.harvestable[plant.tile]
+        del self.plants[plant.tile]
+        self.ripe[plant.tile[1], plant.tile[0]] = False
+        plant.kill()
+
+        # update soil tile data
+        self.grid.clear_crop(plant.tile)
+
+        # write to JSON before the crop is credited, so it cannot be harvested twice
+        self.save()
+
+    def get_soil_mask(self, tile) -> int:
+        x, y = tile
+        mask = 0
+        for bit, (dx, dy) in enumerate(NEIGHBORS):
+            if self.grid.has((x + dx, y + dy), TILLED):
+                mask |= 1 << bit
+        return mask
+
+    def update_soil_tiles(self, tiles):
+        # existing soil sprites keep their place and only swap images
+        for tile in tiles:
+            if self.grid.has(tile, TILLED):
+                surf = self.soil_surfs[TILE_TYPES[self.get_soil_mask(tile)]]
+                if tile in self.soil_tiles:
+                    self.soil_tiles[tile].image = surf
+                else:
+                    self.soil_tiles[tile] = soil_tile_pool.get(
+                        pos = (tile[0] * TILE_SIZE, tile[1] * TILE_SIZE),
+                        surf = surf,
+                        groups = [self.all_sprites, self.soil_sprites]
                     )
@@ -0,0 +1,117 @@
+import numpy as np
+from base64 import b64encode, b64decode
+from zlib import compress, decompress
+
+# tile flags, crop type in the high nibble
+FARMABLE = 1
+TILLED = 2
+WATERED = 4
+PLANTED = 8
+CROP_SHIFT = 4
+CROPS = ['corn', 'tomato']
+
+# legacy save letters
+LETTERS = {'F': FARMABLE, 'X': TILLED, 'W': WATERED}
+CROP_LETTERS = {'C': 'corn', 'T': 'tomato'}
+
+class SoilGrid:
+    def __init__(self, width, height) -> None:
+        self.flags = np.zeros((height, width), dtype = np.uint8)
+
+        # maintained tile sets for the per-night work
+        self.watered = set()
+        self.planted = set()
+
+    @classmethod
+    def from_letters(cls, letters):
+        # import the old list-of-letters save format
+        grid = cls(len(letters[0]), len(letters))
+        for y, row in enumerate(letters):
+            for x, cell in enumerate(row):
+                for letter in cell:
+                    if letter in LETTERS:
+                        grid.set((x, y), LETTERS[letter])
+                    elif letter in CROP_LETTERS:
+                        grid.set_crop((x, y), CROP_LETTERS[letter])
+        return grid
+
+    @classmethod
+    def from_save(cls, data):
+        if isinstance(data, list):
+            return cls.from_letters(data)
+        grid = cls(data['width'], data['height'])
+        flags = np.frombuffer(decompress(b64decode(data['flags'])), dtype = np.uint8)
+        grid.flags[:] = flags.reshape(data['height'], data['width'])
+        grid.watered = set(grid.get_tiles(WATERED))
+        grid.planted = set(grid.get_tiles(PLANTED))
+        return grid
+
+    def to_save(self) -> dict:
+        height, width = self.flags.shape
+        return {
+            'width': width,
+            'height': height,
+            'flags': b64encode(compress(self.flags.tobytes())).decode()
+        }
+
+    def in_bounds(self, tile) -> bool:
+        height, width = self.flags.shape
+        return 0 <= tile[0] < width and 0 <= tile[1] < height
+
+    def has(self, tile, flag) -> bool:
+        return self.in_bounds(tile) and bool(self.flags[tile[1], tile[0]] & flag)
+
+    def set(self, tile, flag) -> None:
+        self.flags[tile[1], tile[0]] |= flag
+        if flag & WATERED:
+            self.watered.add(tile)
+        if flag & PLANTED:
+            self.planted.add(tile)
+
+    def clear(self, tile, flag) -> None:
+        self.flags[tile[1], tile[0]] &= ~np.uint8(flag)
+        if flag & WATERED:
+            self.watered.discard(tile)
+        if flag & PLANTED:
+            self.planted.discard(tile)
+
+    def get_crop(self, tile):
+        # crop name, None when nothing is planted
+        crop = self.flags[tile[1], tile[0]] >> CROP_SHIFT
+        return CROPS[crop - 1] if crop else None
+
+    def set_crop(self, tile, crop) -> None:
+        value = self.flags[tile[1], tile[0]] & 0x0f | PLANTED | (CROPS.index(crop) + 1) << CROP_SHIFT
+        self.flags[tile[1], tile[0]] = value
+        self.planted.add(tile)
+
+    def clear_crop(self, tile) -> None:
+        self.flags[tile[1], tile[0]] &= 0x0f & ~PLANTED
+        self.planted.discard(tile)
+
+    def set_where(self, mask, flag) -> list:
+        # set flag on every masked tile, returning the tiles that changed
+        changed = mask & ((self.flags & flag) == 0)
+        self.flags[changed] |= flag
+        rows, cols = np.nonzero(changed)
+        tiles = list(zip(cols.tolist(), rows.tolist()))
+        if flag & WATERED:
+            self.watered.update(tiles)
+        if flag & PLANTED:
+            self.planted.update(tiles)
+        return tiles
+
+    def get_mask(self, flag) -> np.ndarray:
+        # whole-map query, True where any of the flags is set
+        return (self.flags & flag) != 0
+
+    def get_tiles(self, flag) -> list:
+        rows, cols = np.nonzero(self.flags & flag)
+        return list(zip(cols.tolist(), rows.tolist()))
+
+    def clear_all(self, flag) -> None:
+        self.flags &= ~np.uint8(flag)
+        if flag & WATERED:
+            self.watered.clear()
+        if flag & PLANTED:
+            self.planted.clear()
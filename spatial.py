@@ -0,0 +1,47 @@
+import pygame
+
+class SpatialGrid:
+    def __init__(self, cell_size) -> None:
+        self.cell_size = cell_size
+        self.cells = {}
+        self.entries = {}
+
+    def get_cells(self, rect) -> list:
+        left = int(rect.left // self.cell_size)
+        right = int((rect.right - 1) // self.cell_size)
+        top = int(rect.top // self.cell_size)
+        bottom = int((rect.bottom - 1) // self.cell_size)
+        return [(col, row) for row in range(top, bottom + 1) for col in range(left, right + 1)]
+
+    def insert(self, item, rect) -> None:
+        if item in self.entries:
+            self.remove(item)
+
+        cells = self.get_cells(rect)
+        for cell in cells:
+            if cell not in self.cells:
+                self.cells[cell] = set()
+            self.cells[cell].add(item)
+        self.entries[item] = (pygame.Rect(rect), cells)
+
+    def remove(self, item) -> None:
+        entry = self.entries.pop(item, None)
+        if entry:
+            for cell in entry[1]:
+                bucket = self.cells[cell]
+                bucket.discard(item)
+                if not bucket:
+                    del self.cells[cell]
+
+    def move(self, item, rect) -> None:
+        # only re-index items that actually moved or resized
+        entry = self.entries.get(item)
+        if entry is None or entry[0] != rect:
+            self.insert(item, rect)
+
+    def query(self, rect) -> set:
+        found = set()
+        for cell in self.get_cells(rect):
+            if cell in self.cells:
+                found.update(self.cells[cell])
+        return found
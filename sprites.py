@@ -1,7 +1,11 @@
 import pygame
 from settings import *
-from timer import Timer
-from random import randint, choice
+from timer import Timer, game_clock
+from support import get_silhouette
+from assets import assets
+from pool import SpritePool, Poolable
+from rng import rng
+import numpy as np
 
 class Generic(pygame.sprite.Sprite):
     def __init__(self, pos, surf, groups, z = LAYERS['main']):
@@ -17,71 +21,65 @@ class Interaction(Generic):
         super().__init__(pos, surf, groups)
         self.name = name
 
-class Water(Generic):
-    def __init__(self, pos, frames, groups) -> None:
-        # animation setup
+class Water(pygame.sprite.Sprite):
+    def __init__(self, pos, frames, clock, groups) -> None:
+        super().__init__(groups)
+
+        # animation setup, advanced once per frame by the shared clock
         self.frames = frames
-        self.frame_index = 0
+        self.clock = clock
 
         # sprite setup
-        super().__init__(
-            pos = pos, 
-            surf = self.frames[self.frame_index], 
-            groups = groups,
-            z = LAYERS['water'])
-
-    def animate(self, dt):
-        self.frame_index += 5 * dt
-        if self.frame_index >= len(self.frames):
-            self.frame_index = 0
-        self.image = self.frames[int(self.frame_index)]
+        self.rect = self.frames[0].get_rect(topleft = pos)
+        self.z = LAYERS['water']
 
-    def update(self, dt):
-        self.animate(dt)
+    @property
+    def image(self):
+        return self.frames[self.clock.frame]
 
 class WildFlower(Generic):
     def __init__(self, pos, surf, groups):
         super().__init__(pos, surf, groups)
         self.hitbox = self.rect.copy().inflate((-20, -self.rect.height * 0.9))
 
-class Particle(Generic):
+class Particle(Poolable, Generic):
     def __init__(self, pos, surf, groups, z, duration = 200):
-        super().__init__(pos, surf, groups, z = LAYERS['main'])
-        self.start_time = pygame.time.get_ticks()
-        self.duration = duration
+        self.setup(pos, surf, groups, z, duration)
 
+    def setup(self, pos, surf, groups, z, duration = 200):
         # white surface
-        mask_surf = pygame.mask.from_surface(self.image)
-        new_surf = mask_surf.to_surface()
-        new_surf.set_colorkey((0, 0, 0))
-        self.image = new_surf
-    
+        super().__init__(pos, get_silhouette(surf), groups, z = LAYERS['main'])
+        self.start_time = game_clock.get_ticks()
+        self.duration = duration
+
     def update(self, dt):
-        current_time = pygame.time.get_ticks()
+        current_time = game_clock.get_ticks()
         if current_time - self.start_time > self.duration:
             self.kill()
 
 class Tree(Generic):
     def __init__(self, pos, surf, groups, name, player_add):
         super().__init__(pos, surf, groups)
+        self.all_sprites = groups[0]
+        self.collision_sprites = groups[1]
+        self.random = rng.get('trees')
 
         # tree attributes
         self.health =  4 if name == "Small" else 5
         self.alive = True
         stump_path = f'../graphics/stumps/{"small" if name == "Small" else "large"}.png'
-        self.stump_surf = pygame.image.load(stump_path).convert_alpha()
+        self.stump_surf = assets.image(stump_path)
 
         # apples
-        self.apple_surf = pygame.image.load('../graphics/fruit/apple.png')
+        self.apple_surf = assets.image('../graphics/fruit/apple.png')
         self.apple_pos = APPLE_POS[name]
         self.apple_sprites = pygame.sprite.Group()
-        self.create_fruit()
 
         # inventory addition
         self.player_add = player_add
 
         # import audio
-        self.axe_sound = pygame.mixer.Sound('../audio/axe.mp3')
+        self.axe_sound = assets.sound('../audio/axe.mp3')
         self.axe_sound.set_volume(MASTER_VOL)
 
     def damage(self):
@@ -96,11 +94,11 @@ class Tree(Generic):
 
         # remove apple
         if len(self.apple_sprites.sprites()) > 0:
-            random_apple = choice(self.apple_sprites.sprites())
-            Particle(
+            random_apple = self.random.choice(self.apple_sprites.sprites())
+            particle_pool.get(
                 pos = random_apple.rect.topleft,
                 surf = random_apple.image,
-                groups = self.groups()[0],
+                groups = self.all_sprites,
                 z = LAYERS['fruit']
             )
             self.player_add('apple')
@@ -108,16 +106,17 @@ class Tree(Generic):
 
     def check_death(self):
         if self.health <= 0:
-            Particle(
+            particle_pool.get(
                 pos = self.rect.topleft,
                 surf = self.image,
-                groups = self.groups()[0],
+                groups = self.all_sprites,
                 z = LAYERS['fruit'],
                 duration = 300
             )
             self.image = self.stump_surf
             self.rect = self.image.get_rect(midbottom = self.rect.midbottom)
             self.hitbox = self.rect.copy().inflate((-10, -self.rect.height * 0.6))
+            self.collision_sprites.refresh(self)
             self.player_add('wood')
             self.alive = False
             if ANALYTICS:
@@ -127,14 +126,35 @@ class Tree(Generic):
         if self.alive:
             self.check_death()
 
-    def create_fruit(self):
-        for pos in self.apple_pos:
-            if randint(0, 10) < 2:
-                x = pos[0] + self.rect.left
-                y = pos[1] + self.rect.top
-                Generic(
-                    pos = (x, y),
-                    surf = self.apple_surf,
-                    groups = [self.apple_sprites, self.groups()[0]],
+class Orchard:
+    def __init__(self, trees) -> None:
+        # every apple position of every tree as one slot list
+        self.slots = [
+            (tree, (tree.rect.left + x, tree.rect.top + y))
+            for tree in trees for x, y in tree.apple_pos
+        ]
+        self.apples = [None] * len(self.slots)
+        self.random = rng.get_numpy('fruit')
+        self.respawn()
+
+    def respawn(self):
+        # one roll for every slot, living trees only
+        grown = self.random.integers(0, 11, len(self.slots)) < 2
+        grown &= np.fromiter((tree.alive for tree, pos in self.slots), dtype = bool, count = len(self.slots))
+        present = np.fromiter((apple is not None and apple.alive() for apple in self.apples), dtype = bool, count = len(self.slots))
+
+        # only slots whose apple appears or disappears touch a sprite
+        for index in np.flatnonzero(grown != present).tolist():
+            if grown[index]:
+                tree, pos = self.slots[index]
+                self.apples[index] = Generic(
+                    pos = pos,
+                    surf = tree.apple_surf,
+                    groups = [tree.apple_sprites, tree.all_sprites],
                     z = LAYERS['fruit']
                 )
+            else:
+                self.apples[index].kill()
+                self.apples[index] = None
+
+particle_pool = SpritePool('particle', Particle)
@@ -1,24 +1,53 @@
 import pygame
 from os import walk
+from weakref import WeakKeyDictionary
+from settings import CHUNK_SIZE
+from atlas import read_atlas
 
-def import_folder(path) -> list:
-    surface_list = []
+def read_folder(path) -> tuple:
+    # packed atlas when it is up to date
+    atlas = read_atlas(path)
+    if atlas is not None:
+        return atlas
 
-    # import graphics and parse to surfaces
+    # decode graphics without converting (safe off the main thread)
+    frames = {}
     for folder_name, sub_folder, img_files in walk(path):
         for image in img_files:
             full_path = path + '/' + image
-            image_surf = pygame.image.load(full_path).convert_alpha()
-            surface_list.append(image_surf)
+            frames[image] = pygame.image.load(full_path)
 
-    return surface_list
+    return None, frames
 
-def import_folder_dict(path) -> dict:
-    surface_dict = {}
-    for folder_name, sub_folder, img_files in walk(path):
-        for image in img_files:
-            full_path = path + '/' + image
-            image_surf = pygame.image.load(full_path).convert_alpha()
-            surface_dict[image.split('.')[0]] = image_surf
+def convert_folder(sheet, frames) -> dict:
+    # atlas: convert once and slice, loose files: convert each
+    if sheet is not None:
+        sheet = sheet.convert_alpha()
+        return {image: sheet.subsurface(rect) for image, rect in frames.items()}
+    return {image: surf.convert_alpha() for image, surf in frames.items()}
+
+silhouettes = WeakKeyDictionary()
+
+def get_silhouette(surf) -> pygame.Surface:
+    # white mask of a surface, built once per source image
+    if surf not in silhouettes:
+        mask_surf = pygame.mask.from_surface(surf)
+        new_surf = mask_surf.to_surface()
+        new_surf.set_colorkey((0, 0, 0))
+        silhouettes[surf] = new_surf
+    return silhouettes[surf]
+
+def bake_chunks(tiles) -> dict:
+    chunks = {}
+
+    # composite static tiles onto chunk-sized surfaces
+    for pos, surf in tiles:
+        rect = surf.get_rect(topleft = pos)
+        for row in range(rect.top // CHUNK_SIZE, (rect.bottom - 1) // CHUNK_SIZE + 1):
+            for col in range(rect.left // CHUNK_SIZE, (rect.right - 1) // CHUNK_SIZE + 1):
+                chunk_pos = (col * CHUNK_SIZE, row * CHUNK_SIZE)
+                if chunk_pos not in chunks:
+                    chunks[chunk_pos] = pygame.Surface((CHUNK_SIZE, CHUNK_SIZE), pygame.SRCALPHA).convert_alpha()
+                chunks[chunk_pos].blit(surf, (rect.x - chunk_pos[0], rect.y - chunk_pos[1]))
 
-    return surface_dict
+    return chunks
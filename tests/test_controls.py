@@ -0,0 +1,32 @@
+import pygame
+from controls import Controls
+from timer import game_clock
+
+def step(controls, action, ms) -> bool:
+    game_clock.advance(ms / 1000)
+    fired = controls.repeated(action, delay = 300, interval = 200)
+    controls.end_step()
+    return fired
+
+def test_held_navigation_repeats_after_the_delay():
+    controls = Controls()
+    controls.press(pygame.K_DOWN)
+    fired = [step(controls, 'down', 50) for _ in range(20)]
+
+    # press at 0 ms, then at 300, 500, 700 and 900 ms
+    assert [index for index, value in enumerate(fired) if value] == [0, 6, 10, 14, 18]
+
+def test_release_stops_repeating():
+    controls = Controls()
+    controls.press(pygame.K_UP)
+    assert step(controls, 'up', 10)
+    controls.release(pygame.K_UP)
+    assert not step(controls, 'up', 1000)
+    assert 'up' not in controls.repeats
+
+def test_tap_within_one_step_fires_once():
+    controls = Controls()
+    controls.press(pygame.K_w)
+    controls.release(pygame.K_w)
+    assert step(controls, 'up', 10)
+    assert not step(controls, 'up', 1000)
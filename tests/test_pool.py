@@ -0,0 +1,41 @@
+import pygame
+from pool import SpritePool, Poolable, pools
+
+class Dot(Poolable, pygame.sprite.Sprite):
+    def __init__(self, pos, groups) -> None:
+        super().__init__(groups)
+        self.setup(pos, groups)
+
+    def setup(self, pos, groups) -> None:
+        self.add(groups)
+        self.pos = pos
+
+def test_killed_sprites_are_reused():
+    pool = SpritePool('test dots', Dot)
+    group = pygame.sprite.Group()
+    first = pool.get(pos = (0, 0), groups = group)
+    first.kill()
+    assert not first.alive()
+
+    second = pool.get(pos = (5, 5), groups = group)
+    assert second is first
+    assert second.pos == (5, 5)
+    assert second in group
+    assert pool.stats() == {'size': 0, 'created': 1, 'reused': 1}
+
+def test_double_kill_releases_once():
+    pool = SpritePool('test dots', Dot)
+    sprite = pool.get(pos = (0, 0), groups = pygame.sprite.Group())
+    sprite.kill()
+    sprite.kill()
+    assert pool.free == [sprite]
+
+def test_unpooled_sprites_just_die():
+    group = pygame.sprite.Group()
+    sprite = Dot((0, 0), group)
+    sprite.kill()
+    assert not sprite.alive()
+
+def test_pools_register_by_name():
+    pool = SpritePool('test registry', Dot)
+    assert pools['test registry'] is pool
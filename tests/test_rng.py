@@ -0,0 +1,50 @@
+from rng import RandomStreams
+
+def draw(streams, name) -> list:
+    stream = streams.get(name)
+    return [stream.random() for _ in range(5)]
+
+def test_same_seed_replays_the_same_numbers():
+    first = RandomStreams()
+    first.seed(42)
+    second = RandomStreams()
+    second.seed(42)
+    assert draw(first, 'cows') == draw(second, 'cows')
+    assert (first.get_numpy('rain').random(5) == second.get_numpy('rain').random(5)).all()
+
+def test_streams_are_independent():
+    # drawing from one stream never shifts another
+    busy = RandomStreams()
+    busy.seed(7)
+    draw(busy, 'trees')
+    busy.get_numpy('fruit').random(100)
+
+    quiet = RandomStreams()
+    quiet.seed(7)
+    assert draw(busy, 'cows') == draw(quiet, 'cows')
+    assert (busy.get_numpy('rain').random(5) == quiet.get_numpy('rain').random(5)).all()
+
+def test_streams_differ_by_name_and_seed():
+    streams = RandomStreams()
+    streams.seed(1)
+    cows = draw(streams, 'cows')
+    assert cows != draw(streams, 'trees')
+
+    streams.seed(2)
+    assert cows != draw(streams, 'cows')
+
+def test_get_returns_the_same_stream():
+    streams = RandomStreams()
+    assert streams.get('soil') is streams.get('soil')
+    assert streams.get_numpy('soil') is streams.get_numpy('soil')
+
+def test_reseeding_restarts_streams():
+    streams = RandomStreams()
+    streams.seed(3)
+    before = draw(streams, 'weather')
+    streams.seed(3)
+    assert draw(streams, 'weather') == before
+
+def test_unseeded_sessions_pick_a_seed():
+    streams = RandomStreams()
+    assert isinstance(streams.session_seed, int)
@@ -0,0 +1,52 @@
+from soil import NEIGHBORS, TILE_TYPES, get_tile_type
+
+SOIL_IMAGES = {
+    'o', 'x', 'l', 'r', 'lr', 't', 'b', 'tb', 'tl', 'tr', 'bl', 'br',
+    'tbr', 'tbl', 'tlr', 'blr', 'tm', 'bm', 'lm', 'rm'
+}
+
+def get_mask(tilled, tile) -> int:
+    # neighbor mask the way SoilLayer builds it
+    x, y = tile
+    return sum(1 << bit for bit, (dx, dy) in enumerate(NEIGHBORS) if (x + dx, y + dy) in tilled)
+
+def test_table_covers_every_mask():
+    assert len(TILE_TYPES) == 256
+    assert TILE_TYPES == [get_tile_type(mask) for mask in range(256)]
+    assert set(TILE_TYPES) <= SOIL_IMAGES
+
+def test_lone_and_surrounded_tiles():
+    assert TILE_TYPES[0] == 'o'
+    assert TILE_TYPES[255] == 'x'
+
+    # diagonals alone never connect a tile
+    for mask in range(16):
+        assert TILE_TYPES[mask << 4] == 'o'
+
+def test_rows_and_columns():
+    row = {(0, 0), (1, 0), (2, 0)}
+    assert [TILE_TYPES[get_mask(row, tile)] for tile in sorted(row)] == ['l', 'lr', 'r']
+
+    column = {(0, 0), (0, 1), (0, 2)}
+    assert [TILE_TYPES[get_mask(column, tile)] for tile in sorted(column)] == ['t', 'tb', 'b']
+
+def test_square_corners_and_edges():
+    square = {(x, y) for x in range(3) for y in range(3)}
+    types = {tile: TILE_TYPES[get_mask(square, tile)] for tile in square}
+    assert types[(0, 0)] == 'tl'
+    assert types[(2, 0)] == 'tr'
+    assert types[(0, 2)] == 'bl'
+    assert types[(2, 2)] == 'br'
+    assert types[(1, 1)] == 'x'
+    assert types[(1, 0)] == 'tm'
+    assert types[(1, 2)] == 'bm'
+    assert types[(0, 1)] == 'lm'
+    assert types[(2, 1)] == 'rm'
+
+def test_junction_without_diagonals():
+    # a plus shape has no filled corners, so its arms are paths
+    plus = {(1, 0), (0, 1), (1, 1), (2, 1), (1, 2)}
+    assert TILE_TYPES[get_mask(plus, (1, 1))] == 'x'
+
+    tee = {(0, 0), (1, 0), (2, 0), (1, 1)}
+    assert TILE_TYPES[get_mask(tee, (1, 0))] == 'blr'
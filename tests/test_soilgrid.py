@@ -0,0 +1,72 @@
+import json
+import numpy as np
+from soilgrid import SoilGrid, FARMABLE, TILLED, WATERED, PLANTED
+
+def test_legacy_letters_import():
+    letters = [
+        [['F'], ['F', 'X'], []],
+        [['F', 'X', 'W'], ['F', 'X', 'W', 'C'], ['F', 'X', 'T']]
+    ]
+    grid = SoilGrid.from_save(letters)
+    assert grid.flags.shape == (2, 3)
+    assert grid.has((0, 0), FARMABLE) and not grid.has((0, 0), TILLED)
+    assert grid.has((1, 0), TILLED)
+    assert grid.flags[0, 2] == 0
+    assert grid.get_crop((1, 1)) == 'corn'
+    assert grid.get_crop((2, 1)) == 'tomato'
+    assert grid.get_crop((0, 1)) is None
+    assert grid.watered == {(0, 1), (1, 1)}
+    assert grid.planted == {(1, 1), (2, 1)}
+
+def test_save_round_trip():
+    grid = SoilGrid(4, 3)
+    grid.set((0, 0), FARMABLE | TILLED | WATERED)
+    grid.set((3, 2), FARMABLE | TILLED)
+    grid.set_crop((3, 2), 'tomato')
+
+    # the save has to survive the JSON file it is written to
+    loaded = SoilGrid.from_save(json.loads(json.dumps(grid.to_save())))
+    assert (loaded.flags == grid.flags).all()
+    assert loaded.watered == {(0, 0)}
+    assert loaded.planted == {(3, 2)}
+    assert loaded.get_crop((3, 2)) == 'tomato'
+
+def test_crop_keeps_the_low_flags():
+    grid = SoilGrid(2, 2)
+    grid.set((1, 1), FARMABLE | TILLED | WATERED)
+    grid.set_crop((1, 1), 'corn')
+    grid.set_crop((1, 1), 'tomato')
+    assert grid.get_crop((1, 1)) == 'tomato'
+
+    grid.clear_crop((1, 1))
+    assert grid.get_crop((1, 1)) is None
+    assert not grid.has((1, 1), PLANTED)
+    assert grid.has((1, 1), FARMABLE | TILLED | WATERED)
+    assert grid.planted == set()
+
+def test_has_is_false_out_of_bounds():
+    grid = SoilGrid(2, 2)
+    grid.set((0, 0), FARMABLE)
+    assert not grid.has((-1, 0), FARMABLE)
+    assert not grid.has((2, 0), FARMABLE)
+
+def test_set_where_only_reports_changes():
+    grid = SoilGrid(3, 1)
+    grid.set((0, 0), TILLED | WATERED)
+    grid.set((1, 0), TILLED)
+    assert grid.set_where(grid.get_mask(TILLED), WATERED) == [(1, 0)]
+    assert grid.watered == {(0, 0), (1, 0)}
+
+    grid.clear_all(WATERED)
+    assert grid.watered == set()
+    assert not grid.get_mask(WATERED).any()
+    assert grid.get_tiles(TILLED) == [(0, 0), (1, 0)]
+
+def test_generic_flag_api_keeps_planted_in_sync():
+    grid = SoilGrid(3, 1)
+    grid.set((0, 0), PLANTED)
+    grid.set_where(np.ones((1, 3), dtype = bool), PLANTED)
+    assert grid.planted == set(grid.get_tiles(PLANTED)) == {(0, 0), (1, 0), (2, 0)}
+
+    grid.clear((1, 0), PLANTED)
+    assert grid.planted == set(grid.get_tiles(PLANTED)) == {(0, 0), (2, 0)}
@@ -0,0 +1,45 @@
+import pygame
+from spatial import SpatialGrid
+
+def test_insert_spans_every_overlapped_cell():
+    grid = SpatialGrid(100)
+    grid.insert('a', pygame.Rect(50, 50, 100, 100))
+    assert sorted(grid.entries['a'][1]) == [(0, 0), (0, 1), (1, 0), (1, 1)]
+
+def test_cells_exclude_the_right_and_bottom_edges():
+    grid = SpatialGrid(100)
+    assert grid.get_cells(pygame.Rect(0, 0, 100, 100)) == [(0, 0)]
+    assert grid.get_cells(pygame.Rect(-1, -1, 2, 2)) == [(-1, -1), (0, -1), (-1, 0), (0, 0)]
+
+def test_query_returns_items_in_touched_cells():
+    grid = SpatialGrid(100)
+    grid.insert('near', pygame.Rect(10, 10, 20, 20))
+    grid.insert('far', pygame.Rect(510, 510, 20, 20))
+    assert grid.query(pygame.Rect(0, 0, 150, 150)) == {'near'}
+    assert grid.query(pygame.Rect(0, 0, 600, 600)) == {'near', 'far'}
+
+def test_move_reindexes_and_remove_drops_empty_cells():
+    grid = SpatialGrid(100)
+    grid.insert('a', pygame.Rect(10, 10, 20, 20))
+    grid.move('a', pygame.Rect(310, 10, 20, 20))
+    assert grid.query(pygame.Rect(0, 0, 100, 100)) == set()
+    assert grid.query(pygame.Rect(300, 0, 100, 100)) == {'a'}
+
+    grid.remove('a')
+    assert grid.cells == {}
+    assert grid.entries == {}
+
+def test_move_skips_unchanged_rects():
+    grid = SpatialGrid(100)
+    rect = pygame.Rect(10, 10, 20, 20)
+    grid.insert('a', rect)
+    entry = grid.entries['a']
+    grid.move('a', rect)
+    assert grid.entries['a'] is entry
+
+def test_reinsert_does_not_leave_stale_cells():
+    grid = SpatialGrid(100)
+    grid.insert('a', pygame.Rect(10, 10, 20, 20))
+    grid.insert('a', pygame.Rect(210, 10, 20, 20))
+    assert (0, 0) not in grid.cells
+    assert grid.cells[(2, 0)] == {'a'}
@@ -0,0 +1,40 @@
+import pygame
+from collections import OrderedDict
+from settings import *
+
+class TextRenderer:
+    def __init__(self, max_size = TEXT_CACHE_SIZE) -> None:
+        self.max_size = max_size
+        self.fonts = {}
+        self.surfs = OrderedDict()
+
+        # analytics
+        self.hits = 0
+        self.misses = 0
+
+    def get_font(self, path, size) -> pygame.font.Font:
+        # share one font object per file and size
+        key = (path, size)
+        if key not in self.fonts:
+            self.fonts[key] = pygame.font.Font(path, size)
+        return self.fonts[key]
+
+    def render(self, font, text, antialias, color) -> pygame.Surface:
+        key = (font, text, antialias, color)
+        if key in self.surfs:
+            self.hits += 1
+            self.surfs.move_to_end(key)
+            return self.surfs[key]
+
+        # rasterize and evict the least recently used surface
+        self.misses += 1
+        surf = font.render(text, antialias, color)
+        self.surfs[key] = surf
+        if len(self.surfs) > self.max_size:
+            self.surfs.popitem(last = False)
+        return surf
+
+    def stats(self) -> dict:
+        return {'size': len(self.surfs), 'hits': self.hits, 'misses': self.misses}
+
+text_renderer = TextRenderer()
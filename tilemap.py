@@ -0,0 +1,132 @@
+import pygame
+import os
+import pickle
+import hashlib
+import numpy as np
+from xml.etree import ElementTree
+from pytmx import TiledTileLayer, TiledObjectGroup
+from pytmx.util_pygame import load_pygame
+from settings import *
+from atlas import pack_surfaces
+
+class TileLayer:
+    def __init__(self, name, data, images) -> None:
+        self.name = name
+        self.data = data
+        self.images = images
+
+    def tiles(self):
+        rows, cols = np.nonzero(self.data)
+        for x, y in zip(cols.tolist(), rows.tolist()):
+            yield x, y, self.images[self.data[y, x]]
+
+class MapObject:
+    def __init__(self, x, y, width, height, name, image) -> None:
+        self.x = x
+        self.y = y
+        self.width = width
+        self.height = height
+        self.name = name
+        self.image = image
+
+class CompiledMap:
+    def __init__(self, compiled) -> None:
+        self.width = compiled['width']
+        self.height = compiled['height']
+
+        # one tileset sheet, sliced per gid
+        sheet = pygame.image.frombytes(compiled['sheet'], compiled['sheet_size'], 'RGBA').convert_alpha()
+        self.images = {gid: sheet.subsurface(rect) for gid, rect in compiled['rects'].items()}
+
+        self.layers = {}
+        for name, data in compiled['tile_layers'].items():
+            self.layers[name] = TileLayer(name, data, self.images)
+        for name, records in compiled['object_layers'].items():
+            self.layers[name] = [
+                MapObject(x, y, width, height, obj_name, self.images.get(gid))
+                for x, y, width, height, obj_name, gid in records
+            ]
+
+    def get_layer_by_name(self, name):
+        return self.layers[name]
+
+    def get_blocked(self, names) -> np.ndarray:
+        # tiles covered by any of the layers, indexed [y, x]
+        blocked = np.zeros((self.height, self.width), dtype = bool)
+        for name in names:
+            blocked |= self.layers[name].data != 0
+        return blocked
+
+def get_sources(path) -> list:
+    # the map, its tilesets and every image they reference
+    sources = [path]
+    for tileset in ElementTree.parse(path).getroot().iter('tileset'):
+        if 'source' in tileset.attrib:
+            tsx_path = os.path.join(os.path.dirname(path), tileset.attrib['source'])
+            sources.append(tsx_path)
+            for image in ElementTree.parse(tsx_path).getroot().iter('image'):
+                sources.append(os.path.join(os.path.dirname(tsx_path), image.attrib['source']))
+    return sources
+
+def get_digest(sources) -> str:
+    digest = hashlib.sha1()
+    for source in sources:
+        with open(source, 'rb') as openfile:
+            digest.update(openfile.read())
+    return digest.hexdigest()
+
+def compile_map(path) -> dict:
+    tmx_data = load_pygame(path)
+    tile_layers = {}
+    object_layers = {}
+    gids = set()
+
+    # tile layers as integer arrays, object layers as records
+    for layer in tmx_data.layers:
+        if isinstance(layer, TiledTileLayer):
+            tile_layers[layer.name] = np.array(layer.data, dtype = np.uint16)
+            gids.update(np.unique(tile_layers[layer.name]).tolist())
+        elif isinstance(layer, TiledObjectGroup):
+            object_layers[layer.name] = [(obj.x, obj.y, obj.width, obj.height, obj.name, obj.gid) for obj in layer]
+            gids.update(obj.gid for obj in layer)
+
+    # every used tile image packed onto one sheet
+    gids.discard(0)
+    surfs = [(gid, tmx_data.get_tile_image_by_gid(gid)) for gid in sorted(gids)]
+    sheet, rects = pack_surfaces([(gid, surf) for gid, surf in surfs if surf])
+
+    return {
+        'width': tmx_data.width,
+        'height': tmx_data.height,
+        'sheet': pygame.image.tobytes(sheet, 'RGBA'),
+        'sheet_size': sheet.get_size(),
+        'rects': rects,
+        'tile_layers': tile_layers,
+        'object_layers': object_layers
+    }
+
+compiled_maps = {}
+
+def load_map(path = '../data/map.tmx') -> CompiledMap:
+    # parsed at most once per process
+    if path in compiled_maps:
+        return compiled_maps[path]
+
+    sources = get_sources(path)
+    digest = get_digest(sources)
+    compiled = None
+    if os.path.exists(MAP_CACHE_PATH):
+        with open(MAP_CACHE_PATH, 'rb') as openfile:
+            cached = pickle.load(openfile)
+        if cached['digest'] == digest:
+            compiled = cached['map']
+
+    # recompile when any source changed
+    if compiled is None:
+        compiled = compile_map(path)
+        os.makedirs(os.path.dirname(MAP_CACHE_PATH), exist_ok = True)
+        with open(MAP_CACHE_PATH, 'wb') as outfile:
+            pickle.dump({'digest': digest, 'map': compiled}, outfile, protocol = pickle.HIGHEST_PROTOCOL)
+
+    compiled_maps[path] = CompiledMap(compiled)
+    return compiled_maps[path]
@@ -1,4 +1,15 @@
-import pygame
+class GameClock:
+    def __init__(self) -> None:
+        self.ticks = 0
+
+    def advance(self, dt) -> None:
+        self.ticks += dt * 1000
+
+    def get_ticks(self) -> float:
+        # simulated milliseconds, so timers replay identically
+        return self.ticks
+
+game_clock = GameClock()
 
 class Timer:
     def __init__(self, duration, func = None) -> None:
@@ -9,16 +20,31 @@ class Timer:
 
     def activate(self) -> None:
         self.active = True
-        self.start_time = pygame.time.get_ticks()
+        self.start_time = game_clock.get_ticks()
 
     def deactivate(self) -> None:
         self.active = False
         self.start_time = 0
 
     def update(self) -> None:
-        current_time = pygame.time.get_ticks()
+        current_time = game_clock.get_ticks()
         if current_time - self.start_time >= self.duration:
             if self.func and self.start_time != 0:
                 self.func()
             self.deactivate()
+
+class AnimationClock:
+    def __init__(self, frame_count, speed) -> None:
+        self.frame_count = frame_count
+        self.speed = speed
+        self.frame_index = 0
+
+    @property
+    def frame(self) -> int:
+        return int(self.frame_index)
+
+    def update(self, dt) -> None:
+        self.frame_index += self.speed * dt
+        if self.frame_index >= self.frame_count:
+            self.frame_index = 0
             
\ No newline at end of file
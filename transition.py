@@ -1,15 +1,11 @@
-import pygame
-from settings import *
-
 class Transition:
-    def __init__(self, reset, player) -> None:
+    def __init__(self, reset, player, compositor) -> None:
         # setup
-        self.display_surface = pygame.display.get_surface()
         self.reset = reset
         self.player = player
 
-        # overlay image
-        self.image = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+        # fade tint, blended by the compositor
+        self.compositor = compositor
         self.color = 255
         self.speed = -2
 
@@ -24,6 +20,5 @@ class Transition:
             self.player.sleep = False
             self.speed = -2
         
-        self.image.fill((self.color, self.color, self.color))
-        self.display_surface.blit(self.image, (0, 0), special_flags = pygame.BLEND_RGBA_MULT)
+        self.compositor.set_tint('sleep', (self.color, self.color, self.color))
         
\ No newline at end of file